@@ -1,13 +1,22 @@
 """
 FastAPI Backend - RESTful API for the recommendation engine
 """
-from fastapi import FastAPI, HTTPException, Depends, File, UploadFile, Header
+from fastapi import FastAPI, HTTPException, Depends, File, UploadFile, Header, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict
+from contextlib import asynccontextmanager
+from cachetools import TTLCache
+import atexit
 import os
+import orjson
+import hashlib
 import shutil
+import tempfile
+from pathlib import Path
+import threading
+import time
 from datetime import datetime
 import logging
 
@@ -20,27 +29,51 @@ from utils import Utils
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Initialize components
+db = Database()
+parser = ResumeParser()
+recommender = RecommendationEngine(db)
+# Share one Database (and its connection pool) across components
+auth_manager = AuthManager(db=db)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run one-off startup checks and warm-up before serving requests"""
+    auth_manager.benchmark_bcrypt()
+    recommender.warmup()
+    yield
+
 # Initialize FastAPI app
 app = FastAPI(
     title="PM Internship Recommendation Engine API",
     description="API for matching candidates with PM internship opportunities",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
+# Add CORS middleware. Credentials are not allowed with a "*" origin, so list
+# origins explicitly (comma-separated CORS_ORIGINS; defaults to the Streamlit UI).
+ALLOWED_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:8501,http://127.0.0.1:8501").split(",")
+    if origin.strip()
+)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
+    allow_origins=list(ALLOWED_ORIGINS),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Initialize components
-db = Database()
-parser = ResumeParser()
-recommender = RecommendationEngine(db)
-auth_manager = AuthManager()
+# Unexpected errors are logged and turned into a generic 500 here, so endpoints
+# only raise HTTPException for the errors they mean to report
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Log an unhandled error and return a generic 500 response"""
+    logger.exception("Unhandled error on %s %s: %s", request.method, request.url.path, exc)
+    return JSONResponse({"detail": "Internal error"}, status_code=500)
 
 # Pydantic models for request/response
 class UserRegistration(BaseModel):
@@ -83,26 +116,127 @@ class PasswordResetConfirm(BaseModel):
     reset_token: str
     new_password: str = Field(..., min_length=6)
 
+# Short-lived cache of verified tokens: token digest -> (exp, user_id).
+# Only successful verifications are stored; failures always hit the verifier.
+# The user row itself is read per request, so profile edits made through any
+# worker are visible at once (the cache is per process).
+_token_cache = TTLCache(maxsize=10000, ttl=30)
+_token_cache_lock = threading.Lock()
+
+def _token_cache_key(token: str) -> bytes:
+    """Compact cache key so raw tokens are not kept in memory"""
+    return hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+
+def extract_token(authorization: str) -> str:
+    """Extract token from "Bearer <token>" format"""
+    return authorization.split(" ", 1)[1] if " " in authorization else authorization
+
 # Dependency to get current user from token
-async def get_current_user(authorization: str = Header(None)):
+def get_current_user(authorization: str = Header(None)):
     """Extract and verify user from JWT token"""
     if not authorization:
         raise HTTPException(status_code=401, detail="Authorization header missing")
     
     try:
-        # Extract token from "Bearer <token>" format
-        token = authorization.split(" ")[1] if " " in authorization else authorization
-        user = auth_manager.get_user_from_token(token)
+        token = extract_token(authorization)
+        # A JWT is header.payload.signature; reject anything else before any crypto/DB work
+        if token.count('.') != 2:
+            raise HTTPException(status_code=401, detail="Invalid token format")
+        
+        cache_key = _token_cache_key(token)
+        with _token_cache_lock:
+            cached = _token_cache.get(cache_key)
+        # Never trust a cached verification past the token's own expiry
+        if cached and cached[0] > time.time():
+            user_id = cached[1]
+        else:
+            payload = auth_manager.verify_token(token)
+            user_id = payload.get('user_id') if payload else None
+            if user_id is not None:
+                with _token_cache_lock:
+                    _token_cache[cache_key] = (payload.get('exp', 0), user_id)
         
+        user = auth_manager.get_user(user_id) if user_id is not None else None
         if not user:
             raise HTTPException(status_code=401, detail="Invalid or expired token")
-        
         return user
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Authentication error: {e}")
+        logger.error("Authentication error: %s", e)
         raise HTTPException(status_code=401, detail="Authentication failed")
 
+# Upload handling
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10 MB
+UPLOAD_CHUNK_SIZE = 64 * 1024
+ALLOWED_EXTENSIONS = frozenset({'.pdf', '.docx', '.doc'})
+ALLOWED_CONTENT_TYPES = frozenset({
+    'application/pdf',
+    'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/octet-stream',  # Generic type some clients send; magic bytes decide
+})
+# Leading bytes each resume format must start with
+FILE_SIGNATURES = {
+    '.pdf': b'%PDF-',
+    '.docx': b'PK\x03\x04',
+    '.doc': b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',  # OLE2 compound document
+}
+
+def has_valid_signature(path: str, file_extension: str) -> bool:
+    """Check the file's magic bytes match its extension"""
+    signature = FILE_SIGNATURES[file_extension]
+    with open(path, "rb") as f:
+        return f.read(len(signature)) == signature
+
+# Uploads are written under a private (0700, per-process) temp dir with generated
+# names only, so client filenames can neither collide nor escape the directory.
+UPLOAD_TMP_DIR = tempfile.mkdtemp(prefix="resumes-")
+atexit.register(shutil.rmtree, UPLOAD_TMP_DIR, ignore_errors=True)
+
+def save_upload(file: UploadFile, file_extension: str) -> str:
+    """Stream an uploaded file to a unique temp file in chunks; returns its path"""
+    written = 0
+    with tempfile.NamedTemporaryFile(suffix=file_extension, dir=UPLOAD_TMP_DIR, delete=False) as tmp:
+        temp_path = tmp.name
+        while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > MAX_UPLOAD_BYTES:
+                break
+            tmp.write(chunk)
+    
+    if written > MAX_UPLOAD_BYTES:
+        os.remove(temp_path)
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
+        )
+    return temp_path
+
+def parse_uploaded_resume(file: UploadFile) -> Optional[Dict]:
+    """Validate, store and parse an uploaded resume; the temp file is always removed"""
+    # Validate file type from the name and declared content type before touching disk
+    file_extension = Path(file.filename or "").suffix.lower()
+    if file_extension not in ALLOWED_EXTENSIONS or (
+        file.content_type and file.content_type not in ALLOWED_CONTENT_TYPES
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
+        )
+    
+    temp_path = save_upload(file, file_extension)
+    try:
+        # Reject content that does not match the extension before parsing
+        if not has_valid_signature(temp_path, file_extension):
+            raise HTTPException(status_code=400, detail="File content does not match its type")
+        return parser.parse_resume(temp_path)
+    finally:
+        os.remove(temp_path)
+
 # API Endpoints
+# Handlers that hit the database, bcrypt or the resume parser are plain `def`
+# so FastAPI runs them in its threadpool instead of blocking the event loop.
 
 @app.get("/")
 async def root():
@@ -120,139 +254,109 @@ async def root():
 
 # Authentication endpoints
 @app.post("/auth/register")
-async def register(user_data: UserRegistration):
+def register(user_data: UserRegistration):
     """Register a new user"""
-    try:
-        success, message, user_id = auth_manager.register_user(user_data.dict())
-        
-        if success:
-            # Auto-login after registration
-            _, _, token, user_info = auth_manager.login_user(
-                user_data.email, 
-                user_data.password
-            )
-            return {
-                "success": True,
-                "message": message,
-                "user_id": user_id,
-                "token": token,
-                "user": user_info
-            }
-        else:
-            raise HTTPException(status_code=400, detail=message)
-    except HTTPException as exc:
-        # Preserve intended HTTP errors (e.g., 400 Already exists)
-        raise exc
-    except Exception as e:
-        logger.error(f"Registration error: {e}")
-        raise HTTPException(status_code=500, detail="Registration failed")
+    # Unset optional fields stay out of the dict instead of being sanitized to ""
+    success, message, user_id = auth_manager.register_user(
+        user_data.model_dump(exclude_none=True)
+    )
+    
+    if success:
+        # Auto-login after registration; the password was just hashed and
+        # the body already validated, so skip login_user's bcrypt re-check
+        token = auth_manager.generate_token(user_id, user_data.email)
+        user_info = auth_manager.get_user(user_id)
+        return {
+            "success": True,
+            "message": message,
+            "user_id": user_id,
+            "token": token,
+            "user": user_info
+        }
+    else:
+        raise HTTPException(status_code=400, detail=message)
 
 @app.post("/auth/login")
-async def login(credentials: UserLogin):
+def login(credentials: UserLogin):
     """Login user and return JWT token"""
-    try:
-        success, message, token, user_data = auth_manager.login_user(
-            credentials.email,
-            credentials.password
-        )
-        
-        if success:
-            return {
-                "success": True,
-                "message": message,
-                "token": token,
-                "user": user_data
-            }
-        else:
-            raise HTTPException(status_code=401, detail=message)
+    success, message, token, user_data = auth_manager.login_user(
+        credentials.email,
+        credentials.password
+    )
     
-    except Exception as e:
-        logger.error(f"Login error: {e}")
-        raise HTTPException(status_code=500, detail="Login failed")
+    if success:
+        return {
+            "success": True,
+            "message": message,
+            "token": token,
+            "user": user_data
+        }
+    else:
+        raise HTTPException(status_code=401, detail=message)
 
 @app.post("/auth/refresh")
-async def refresh_token(current_user: dict = Depends(get_current_user)):
+def refresh_token(
+    authorization: str = Header(None),
+    current_user: dict = Depends(get_current_user)
+):
     """Refresh JWT token"""
-    try:
-        # Get current token from header
-        authorization = Header()
-        token = authorization.split(" ")[1] if " " in authorization else authorization
-        
-        new_token = auth_manager.refresh_token(token)
-        
-        if new_token:
-            return {
-                "success": True,
-                "token": new_token
-            }
-        else:
-            raise HTTPException(status_code=401, detail="Failed to refresh token")
+    # get_current_user has already validated the header
+    new_token = auth_manager.refresh_token(extract_token(authorization))
     
-    except Exception as e:
-        logger.error(f"Token refresh error: {e}")
-        raise HTTPException(status_code=500, detail="Token refresh failed")
+    if new_token:
+        return {
+            "success": True,
+            "token": new_token
+        }
+    else:
+        raise HTTPException(status_code=401, detail="Failed to refresh token")
 
 @app.post("/auth/password/update")
-async def update_password(
+def update_password(
     password_data: PasswordUpdate,
     current_user: dict = Depends(get_current_user)
 ):
     """Update user password"""
-    try:
-        success, message = auth_manager.update_password(
-            current_user['id'],
-            password_data.old_password,
-            password_data.new_password
-        )
-        
-        if success:
-            return {"success": True, "message": message}
-        else:
-            raise HTTPException(status_code=400, detail=message)
+    success, message = auth_manager.update_password(
+        current_user['id'],
+        password_data.old_password,
+        password_data.new_password
+    )
     
-    except Exception as e:
-        logger.error(f"Password update error: {e}")
-        raise HTTPException(status_code=500, detail="Password update failed")
+    if success:
+        return {"success": True, "message": message}
+    else:
+        raise HTTPException(status_code=400, detail=message)
 
 @app.post("/auth/password/reset")
-async def request_password_reset(reset_data: PasswordReset):
+def request_password_reset(reset_data: PasswordReset):
     """Request password reset token"""
-    try:
-        success, message, reset_token = auth_manager.reset_password_request(
-            reset_data.email
-        )
-        
-        if success:
-            # In production, send this token via email
-            return {
-                "success": True,
-                "message": message,
-                "reset_token": reset_token  # Remove in production
-            }
-        else:
-            raise HTTPException(status_code=404, detail=message)
+    success, message, reset_token = auth_manager.reset_password_request(
+        reset_data.email
+    )
     
-    except Exception as e:
-        logger.error(f"Password reset request error: {e}")
-        raise HTTPException(status_code=500, detail="Password reset request failed")
+    if success:
+        # In production, send this token via email
+        return {
+            "success": True,
+            "message": message,
+            "reset_token": reset_token  # Remove in production
+        }
+    else:
+        raise HTTPException(status_code=404, detail=message)
 
 @app.post("/auth/password/reset/confirm")
-async def confirm_password_reset(reset_confirm: PasswordResetConfirm):
+def confirm_password_reset(reset_confirm: PasswordResetConfirm):
     """Confirm password reset with token"""
-    try:
-        success, message = auth_manager.reset_password_confirm(
-            reset_confirm.reset_token,
-            reset_confirm.new_password
-        )
-        
-        if success:
-            return {"success": True, "message": message}
-        else:
-            raise HTTPException(status_code=400, detail=message)
+    success, message = auth_manager.reset_password_confirm(
+        reset_confirm.reset_token,
+        reset_confirm.new_password
+    )
     
-    except Exception as e:
-        logger.error(f"Password reset confirm error: {e}")
-        raise HTTPException(status_code=500, detail="Password reset failed")
+    if success:
+        return {"success": True, "message": message}
+    else:
+        raise HTTPException(status_code=400, detail=message)
 
 # Candidate endpoints
 @app.get("/candidates/profile")
@@ -264,341 +368,271 @@ async def get_profile(current_user: dict = Depends(get_current_user)):
     }
 
 @app.put("/candidates/profile")
-async def update_profile(
+def update_profile(
     profile_data: CandidateProfileUpdate,
     current_user: dict = Depends(get_current_user)
 ):
     """Update user profile"""
-    try:
-        update_data = profile_data.dict(exclude_unset=True)
-        # Enforce password verification for profile updates
-        if not update_data.get('current_password'):
-            raise HTTPException(status_code=400, detail="Current password is required to update profile")
-        # Verify password
-        user_record = db.get_candidate(candidate_id=current_user['id'])
-        if not user_record:
-            raise HTTPException(status_code=404, detail="User not found")
-        if not auth_manager.verify_password_bcrypt(update_data['current_password'], user_record['password_hash']):
-            raise HTTPException(status_code=401, detail="Invalid current password")
-        # Remove auth-only field
-        update_data.pop('current_password', None)
-        logger.info(f"Updating candidate {current_user['id']} with data: {update_data}")
-        success = db.update_candidate(current_user['id'], update_data)
+    update_data = profile_data.model_dump(exclude_unset=True)
+    # Enforce password verification for profile updates
+    if not update_data.get('current_password'):
+        raise HTTPException(status_code=400, detail="Current password is required to update profile")
+    # Verify password
+    user_record = db.get_auth_row(candidate_id=current_user['id'])
+    if not user_record:
+        raise HTTPException(status_code=404, detail="User not found")
+    if not auth_manager.verify_password(update_data['current_password'], user_record['password_hash']):
+        raise HTTPException(status_code=401, detail="Invalid current password")
+    # Remove auth-only field
+    update_data.pop('current_password', None)
+    logger.debug("Updating candidate %s with data: %s", current_user['id'], update_data)
+    updated_user = db.update_candidate_returning(current_user['id'], update_data)
+    
+    if updated_user:
+        # Clear cached recommendations for this candidate since profile changed
+        db.clear_recommendations_for_candidate(current_user['id'])
+        logger.info("Cleared recommendations for candidate %s after profile update", current_user['id'])
         
-        if success:
-            # Clear cached recommendations for this candidate since profile changed
-            db.clear_recommendations_for_candidate(current_user['id'])
-            logger.info(f"Cleared recommendations for candidate {current_user['id']} after profile update")
-            
-            # Get updated profile
-            updated_user = db.get_candidate(candidate_id=current_user['id'])
-            return {
-                "success": True,
-                "message": "Profile updated successfully. Recommendations will be recalculated.",
-                "profile": {
-                    k: v for k, v in updated_user.items() 
-                    if k != 'password_hash'
-                }
+        return {
+            "success": True,
+            "message": "Profile updated successfully. Recommendations will be recalculated.",
+            "profile": {
+                k: v for k, v in updated_user.items() 
+                if k != 'password_hash'
             }
-        else:
-            raise HTTPException(status_code=400, detail="Failed to update profile")
-    
-    except Exception as e:
-        logger.error(f"Profile update error: {e}")
-        raise HTTPException(status_code=500, detail="Profile update failed")
+        }
+    else:
+        raise HTTPException(status_code=400, detail="Failed to update profile")
 
 @app.post("/candidates/upload_resume")
-async def upload_resume(
+def upload_resume(
     file: UploadFile = File(...),
     current_user: dict = Depends(get_current_user)
 ):
     """Upload and parse resume"""
-    try:
-        # Validate file type
-        allowed_extensions = ['.pdf', '.docx', '.doc']
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        
-        if file_extension not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
-            )
-        
-        # Save uploaded file temporarily
-        temp_path = f"temp_{current_user['id']}_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Parse resume
-        parsed_data = parser.parse_resume(temp_path)
-        
-        # Clean up temp file
-        os.remove(temp_path)
-        
-        if not parsed_data:
-            raise HTTPException(status_code=400, detail="Failed to parse resume")
-        
-        # Don't override email from resume
-        if 'email' in parsed_data:
-            del parsed_data['email']
-        
-        return {
-            "success": True,
-            "message": "Resume parsed successfully",
-            "parsed_data": parsed_data
-        }
+    parsed_data = parse_uploaded_resume(file)
     
-    except Exception as e:
-        logger.error(f"Resume upload error: {e}")
-        # Clean up temp file if it exists
-        if 'temp_path' in locals() and os.path.exists(temp_path):
-            os.remove(temp_path)
-        raise HTTPException(status_code=500, detail="Resume processing failed")
+    if not parsed_data:
+        raise HTTPException(status_code=400, detail="Failed to parse resume")
+    
+    # Don't override email from resume
+    if 'email' in parsed_data:
+        del parsed_data['email']
+    
+    return {
+        "success": True,
+        "message": "Resume parsed successfully",
+        "parsed_data": parsed_data
+    }
 
 # Public resume parse for signup auto-fill (no auth required)
 @app.post("/parse_resume")
-async def parse_resume_public(file: UploadFile = File(...)):
+def parse_resume_public(file: UploadFile = File(...)):
     """Parse resume without authentication for signup auto-fill"""
-    try:
-        # Validate file type
-        allowed_extensions = ['.pdf', '.docx', '.doc']
-        file_extension = os.path.splitext(file.filename)[1].lower()
-        if file_extension not in allowed_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
-            )
-
-        temp_path = f"temp_signup_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        parsed_data = parser.parse_resume(temp_path)
+    parsed_data = parse_uploaded_resume(file)
 
-        # Clean up temp file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    if not parsed_data:
+        raise HTTPException(status_code=400, detail="Failed to parse resume")
 
-        if not parsed_data:
-            raise HTTPException(status_code=400, detail="Failed to parse resume")
-
-        return {
-            "success": True,
-            "message": "Resume parsed successfully",
-            "parsed_data": parsed_data
-        }
-    except Exception as e:
-        logger.error(f"Public resume parse error: {e}")
-        # Cleanup just in case
-        try:
-            if 'temp_path' in locals() and os.path.exists(temp_path):
-                os.remove(temp_path)
-        except Exception:
-            pass
-        raise HTTPException(status_code=500, detail="Resume processing failed")
+    return {
+        "success": True,
+        "message": "Resume parsed successfully",
+        "parsed_data": parsed_data
+    }
 
 # Internship endpoints
+# The catalog changes rarely, so serialized listing pages are kept briefly
+# and clients/proxies may revalidate them with If-None-Match.
+INTERNSHIPS_CACHE_SECONDS = 60
+_internships_cache = TTLCache(maxsize=256, ttl=INTERNSHIPS_CACHE_SECONDS)
+_internships_cache_lock = threading.Lock()
+
 @app.get("/internships")
-async def get_internships(
-    limit: int = 20,
-    offset: int = 0
+def get_internships(
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    if_none_match: Optional[str] = Header(None)
 ):
     """Get list of all internships"""
-    try:
-        internships = db.get_all_internships(active_only=True)
-        
-        # Apply pagination
-        paginated = internships[offset:offset + limit]
+    cache_key = (limit, offset)
+    with _internships_cache_lock:
+        cached = _internships_cache.get(cache_key)
+    
+    if cached:
+        body, etag = cached
+    else:
+        # Paginate in SQL so only the requested page is materialized
+        internships = db.get_all_internships(active_only=True, limit=limit, offset=offset)
+        total = db.count_internships(active_only=True)
         
-        return {
+        body = orjson.dumps({
             "success": True,
-            "total": len(internships),
+            "total": total,
             "limit": limit,
             "offset": offset,
-            "internships": paginated
-        }
+            "internships": internships
+        })
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        with _internships_cache_lock:
+            _internships_cache[cache_key] = (body, etag)
     
-    except Exception as e:
-        logger.error(f"Get internships error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch internships")
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={INTERNSHIPS_CACHE_SECONDS}"
+    }
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.get("/internships/{internship_id}")
-async def get_internship(internship_id: int):
+def get_internship(internship_id: int):
     """Get specific internship details"""
-    try:
-        internship = db.get_internship(internship_id)
-        
-        if internship:
-            return {
-                "success": True,
-                "internship": internship
-            }
-        else:
-            raise HTTPException(status_code=404, detail="Internship not found")
+    internship = db.get_internship(internship_id)
     
-    except Exception as e:
-        logger.error(f"Get internship error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch internship")
+    if internship:
+        return {
+            "success": True,
+            "internship": internship
+        }
+    else:
+        raise HTTPException(status_code=404, detail="Internship not found")
 
 # Recommendation endpoints
 @app.get("/recommendations")
-async def get_recommendations(
+def get_recommendations(
     current_user: dict = Depends(get_current_user),
     limit: int = 5,
     use_cache: bool = True
 ):
     """Get personalized internship recommendations"""
-    try:
-        recommendations = recommender.get_recommendations(
-            current_user['id'],
-            top_n=limit,
-            use_cache=use_cache
-        )
-        
-        # Format recommendations for response
-        formatted_recommendations = [
-            Utils.format_recommendation_card(rec) 
-            for rec in recommendations
-        ]
-        
-        # Check which ones are saved
-        for rec in formatted_recommendations:
-            rec['is_saved'] = db.is_internship_saved(
-                current_user['id'], 
-                rec.get('internship_id', 0)
-            )
-        
-        return {
-            "success": True,
-            "count": len(formatted_recommendations),
-            "recommendations": formatted_recommendations
-        }
+    recommendations = recommender.get_recommendations(
+        current_user['id'],
+        top_n=limit,
+        use_cache=use_cache
+    )
     
-    except Exception as e:
-        logger.error(f"Get recommendations error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to generate recommendations")
+    # Format recommendations for response
+    formatted_recommendations = [
+        Utils.format_recommendation_card(rec) 
+        for rec in recommendations
+    ]
+    
+    # Check which ones are saved with a single lookup
+    saved_ids = db.get_saved_internship_ids(current_user['id'])
+    for rec in formatted_recommendations:
+        rec['is_saved'] = rec.get('internship_id', 0) in saved_ids
+    
+    return {
+        "success": True,
+        "count": len(formatted_recommendations),
+        "recommendations": formatted_recommendations
+    }
 
 @app.post("/internships/{internship_id}/save")
-async def save_internship(
+def save_internship(
     internship_id: int,
     current_user: dict = Depends(get_current_user)
 ):
     """Save an internship to user's list"""
-    try:
-        success = db.save_internship(current_user['id'], internship_id)
-        
-        if success:
-            return {
-                "success": True,
-                "message": "Internship saved successfully"
-            }
-        else:
-            return {
-                "success": False,
-                "message": "Internship already saved"
-            }
+    success = db.save_internship(current_user['id'], internship_id)
     
-    except Exception as e:
-        logger.error(f"Save internship error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to save internship")
+    if success:
+        return {
+            "success": True,
+            "message": "Internship saved successfully"
+        }
+    else:
+        return {
+            "success": False,
+            "message": "Internship already saved"
+        }
 
 @app.delete("/internships/{internship_id}/save")
-async def unsave_internship(
+def unsave_internship(
     internship_id: int,
     current_user: dict = Depends(get_current_user)
 ):
     """Remove internship from user's saved list"""
-    try:
-        success = db.unsave_internship(current_user['id'], internship_id)
-        
-        if success:
-            return {
-                "success": True,
-                "message": "Internship removed from saved list"
-            }
-        else:
-            return {
-                "success": False,
-                "message": "Internship not in saved list"
-            }
+    success = db.unsave_internship(current_user['id'], internship_id)
     
-    except Exception as e:
-        logger.error(f"Unsave internship error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to unsave internship")
+    if success:
+        return {
+            "success": True,
+            "message": "Internship removed from saved list"
+        }
+    else:
+        return {
+            "success": False,
+            "message": "Internship not in saved list"
+        }
 
 @app.get("/saved-internships")
-async def get_saved_internships(
+def get_saved_internships(
     current_user: dict = Depends(get_current_user)
 ):
     """Get all saved internships for current user"""
-    try:
-        saved = db.get_saved_internships(current_user['id'])
-        
-        return {
-            "success": True,
-            "count": len(saved),
-            "internships": saved
-        }
+    saved = db.get_saved_internships(current_user['id'])
     
-    except Exception as e:
-        logger.error(f"Get saved internships error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch saved internships")
+    return {
+        "success": True,
+        "count": len(saved),
+        "internships": saved
+    }
 
 @app.get("/recommendations/{candidate_id}")
-async def get_recommendations_for_candidate(
+def get_recommendations_for_candidate(
     candidate_id: int,
     limit: int = 5,
     current_user: dict = Depends(get_current_user)
 ):
     """Get recommendations for specific candidate (admin feature)"""
-    try:
-        # In production, check if current user has admin privileges
-        recommendations = recommender.get_recommendations(
-            candidate_id,
-            top_n=limit,
-            use_cache=False
-        )
-        
-        return {
-            "success": True,
-            "candidate_id": candidate_id,
-            "count": len(recommendations),
-            "recommendations": recommendations
-        }
+    # In production, check if current user has admin privileges
+    recommendations = recommender.get_recommendations(
+        candidate_id,
+        top_n=limit,
+        use_cache=False
+    )
     
-    except Exception as e:
-        logger.error(f"Get candidate recommendations error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to generate recommendations")
+    return {
+        "success": True,
+        "candidate_id": candidate_id,
+        "count": len(recommendations),
+        "recommendations": recommendations
+    }
 
 # Utility endpoints
 @app.post("/seed_data")
-async def seed_data():
+def seed_data():
     """Seed database with sample data (development only)"""
-    try:
-        # Create sample data files
-        Utils.create_sample_files()
-        
-        # Seed internships
-        success = db.seed_internships("data/internships.json")
-        
-        if success:
-            return {
-                "success": True,
-                "message": "Database seeded successfully"
-            }
-        else:
-            raise HTTPException(status_code=500, detail="Failed to seed database")
+    # Create sample data files
+    Utils.create_sample_files()
     
-    except Exception as e:
-        logger.error(f"Seed data error: {e}")
-        raise HTTPException(status_code=500, detail="Database seeding failed")
+    # Seed internships
+    success = db.seed_internships("data/internships.json")
+    
+    if success:
+        with _internships_cache_lock:
+            _internships_cache.clear()
+        return {
+            "success": True,
+            "message": "Database seeded successfully"
+        }
+    else:
+        raise HTTPException(status_code=500, detail="Failed to seed database")
+
+# Load balancers poll /health several times a second; refresh the
+# timestamp string at most once per second. [monotonic time, iso string]
+_health_timestamp = [float('-inf'), ""]
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    now = time.monotonic()
+    if now - _health_timestamp[0] >= 1.0:
+        _health_timestamp[:] = [now, datetime.utcnow().isoformat()]
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _health_timestamp[1]
     }
 
 # Run the application
@@ -614,12 +648,19 @@ if __name__ == "__main__":
     except Exception:
         pass
     
-    # Run server
+    # Run server. Several worker processes by default; set API_RELOAD=1 for a
+    # single auto-reloading dev process. loop/http "auto" pick uvloop and
+    # httptools when they are installed.
+    reload = os.getenv("API_RELOAD", "0") == "1"
+    workers = int(os.getenv("WORKERS", (os.cpu_count() or 1) * 2 + 1))
     uvicorn.run(
         "api:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        reload=reload,
+        workers=None if reload else workers,
+        loop="auto",
+        http="auto",
         log_level="info"
     )
     
\ No newline at end of file
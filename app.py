@@ -3,14 +3,35 @@ Streamlit Frontend - Interactive UI for PM Internship Recommendation Engine
 """
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import Dict, List, Optional
-import pandas as pd
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import os
+from pathlib import Path
+from functools import lru_cache
+from itertools import islice
+import html
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
+# (connect, read) seconds, so a stalled backend cannot hang the UI
+API_TIMEOUT = (3, 10)
+
+# One pooled session for all API calls so connections to the backend are reused
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.1)
+))
+_SESSION.headers.update({"Accept-Encoding": "gzip"})
 
 # Page configuration
 st.set_page_config(
@@ -20,196 +41,202 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better UI
-st.markdown("""
-<style>
-    .main {
-        padding: 0rem 1rem;
-    }
-    .stButton button {
-        width: 100%;
-        border-radius: 6px;
-        margin: 6px 0;
-    }
-    .stButton button[kind="primary"] {
-        background-color: #4CAF50;
-        color: white;
-    }
-    /* Removed overly-broad column button override to prevent stray UI artifacts */
-    .recommendation-card {
-        background-color: #f0f2f5;
-        border-radius: 10px;
-        padding: 20px;
-        margin: 10px 0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    .skill-badge {
-        display: inline-block;
-        background-color: #e3f2fd;
-        color: #1976d2;
-        padding: 4px 12px;
-        border-radius: 15px;
-        margin: 2px;
-        font-size: 0.85em;
-    }
-    .skill-gap-badge {
-        display: inline-block;
-        background-color: #fff3e0;
-        color: #f57c00;
-        padding: 4px 12px;
-        border-radius: 15px;
-        margin: 2px;
-        font-size: 0.85em;
-    }
-    .match-score-high {
-        color: #4CAF50;
-        font-weight: bold;
-    }
-    .match-score-medium {
-        color: #FFC107;
-        font-weight: bold;
-    }
-    .match-score-low {
-        color: #f44336;
-        font-weight: bold;
-    }
-    div[data-testid="stSidebar"] > div {
-        padding-bottom: 100px;
-    }
-    .match-box {
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: center;
-        width: 120px;
-        min-width: 120px;
-        height: 120px;
-        border-radius: 18px;
-        background: #ffffff;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.08);
-        border: 1px solid #e6e6e6;
-    }
-    .match-box .percent {
-        font-size: 34px;
-        font-weight: 800;
-        line-height: 1;
-        margin-bottom: 6px;
-    }
-    .match-box .label {
-        font-size: 14px;
-        color: #666666;
-    }
-    .match-box.high { border-left: 6px solid #4CAF50; }
-    .match-box.medium { border-left: 6px solid #FFC107; }
-    .match-box.low { border-left: 6px solid #f44336; }
-    /* Sidebar cards */
-    .sidebar-card {
-        background: #ffffff;
-        border: 1px solid #e6e6e6;
-        border-radius: 12px;
-        padding: 12px 14px;
-        box-shadow: 0 1px 2px rgba(0,0,0,0.04);
-        margin: 10px 8px;
-    }
-    .profile-card-title {
-        display: flex;
-        align-items: center;
-        justify-content: space-between;
-        gap: 8px;
-    }
-    .stat-row {
-        display: grid;
-        grid-template-columns: 1fr 1fr;
-        gap: 8px;
-        margin-top: 2px;
-    }
-    .stat-card {
-        background: #f8fafc;
-        border: 1px solid #e8eef5;
-        border-radius: 10px;
-        padding: 10px 12px;
-        text-align: left;
-    }
-    .stat-label {
-        font-size: 12px;
-        color: #667085;
-        margin-bottom: 4px;
-    }
-    .stat-number {
-        font-size: 20px;
-        font-weight: 800;
-        color: #111827;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Session state initialization
-if 'token' not in st.session_state:
-    st.session_state.token = None
-if 'user' not in st.session_state:
-    st.session_state.user = None
-if 'page' not in st.session_state:
-    st.session_state.page = 'login'
-if 'recommendations' not in st.session_state:
-    st.session_state.recommendations = None
-if 'parsed_resume' not in st.session_state:
-    st.session_state.parsed_resume = None
-# Signup autofill session keys
-if 'signup_name' not in st.session_state:
-    st.session_state.signup_name = ''
-if 'signup_education' not in st.session_state:
-    st.session_state.signup_education = ''
-if 'signup_location' not in st.session_state:
-    st.session_state.signup_location = ''
-if 'signup_phone' not in st.session_state:
-    st.session_state.signup_phone = ''
-if 'signup_skills' not in st.session_state:
-    st.session_state.signup_skills = ''
-if 'signup_email' not in st.session_state:
-    st.session_state.signup_email = ''
-if 'signup_linkedin' not in st.session_state:
-    st.session_state.signup_linkedin = ''
-if 'signup_github' not in st.session_state:
-    st.session_state.signup_github = ''
+@st.cache_data(show_spinner=False)
+def _css() -> str:
+    """Read the stylesheet once per process"""
+    return (Path(__file__).parent / "assets" / "app.css").read_text()
+
+# Custom CSS for better UI. Streamlit drops elements that a rerun does not
+# emit again, so the <style> tag goes out every run; only the file read is cached.
+st.markdown(f"<style>{_css()}</style>", unsafe_allow_html=True)
+
+# Signup form fields autofilled from a parsed resume ("signup_<resume field>")
+_SIGNUP_KEYS = (
+    'signup_name', 'signup_email', 'signup_education', 'signup_location',
+    'signup_phone', 'signup_skills', 'signup_linkedin', 'signup_github',
+)
+
+# Session state defaults, applied only to keys not set yet
+_SESSION_DEFAULTS = {
+    'token': None,
+    'user': None,
+    'page': 'login',
+    'recommendations': None,
+    'parsed_resume': None,
+    # Bumped after this session's writes so only its cached reads are refetched
+    'cache_version': 0,
+    # Signup autofill session keys
+    **dict.fromkeys(_SIGNUP_KEYS, ''),
+}
+for _key, _value in _SESSION_DEFAULTS.items():
+    st.session_state.setdefault(_key, _value)
+
+# Education choices for the signup and profile forms, with option -> index maps
+_EDU_SIGNUP = ("", "High School", "Diploma", "Bachelor's", "Master's", "PhD")
+_EDU_SIGNUP_IDX = {v: i for i, v in enumerate(_EDU_SIGNUP)}
+_EDU_PROFILE = _EDU_SIGNUP[1:]
+_EDU_PROFILE_IDX = {v: i for i, v in enumerate(_EDU_PROFILE)}
+
+# Cards rendered per page in the saved list
+PAGE_SIZE = 10
+
+# Greeting for each hour of the day: morning before 12, afternoon before 17
+_GREETINGS = ("Good morning",) * 12 + ("Good afternoon",) * 5 + ("Good evening",) * 7
+
+# Comma separator with surrounding whitespace, for skills strings
+_SKILL_SPLIT_RE = re.compile(r"\s*,\s*")
+
+# Match badge parsing: percentage digits and the leading colour emoji
+_MATCH_PCT_RE = re.compile(r"(\d+)%")
+_MATCH_LEVELS = {'🟢': 'high', '🟡': 'medium', '🔴': 'low'}
 
 # Helper functions
+class _ApiError(Exception):
+    """Non-200 API response; raised so failed GETs are never cached"""
+    def __init__(self, status_code: int, payload: Dict):
+        super().__init__(status_code)
+        self.status_code = status_code
+        self.payload = payload
+
+def _error_payload(response) -> Dict:
+    """Decode an error response body, falling back to its raw text"""
+    try:
+        return response.json()
+    except ValueError:
+        return {"detail": response.text}
+
+def _get_json(endpoint: str, authorization: Optional[str]) -> Dict:
+    """GET an endpoint and decode it, raising _ApiError on a non-2xx status"""
+    headers = {"Authorization": authorization} if authorization else None
+    response = _SESSION.get(f"{API_BASE_URL}{endpoint}", headers=headers, timeout=API_TIMEOUT)
+    if not response.ok:
+        raise _ApiError(response.status_code, _error_payload(response))
+    return response.json()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_get(endpoint: str, authorization: Optional[str], version: int) -> Dict:
+    """GET an endpoint; successful responses are reused across reruns for a minute
+    (version is only part of the key: see invalidate_user_cache)"""
+    return _get_json(endpoint, authorization)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_recommendations(profile_hash: str, authorization: Optional[str], version: int) -> Dict:
+    """GET /recommendations; reused until the profile (and so its hash) changes"""
+    return _get_json("/recommendations", authorization)
+
+def invalidate_user_cache():
+    """Make this session's next cached reads miss, leaving other sessions' entries alone"""
+    # st.cache_data is process-wide, so .clear() would wipe every user's cache
+    st.session_state.cache_version += 1
+
+def profile_hash(user: Dict) -> str:
+    """Stable digest of a profile, used to key recommendation caching"""
+    return hashlib.md5(json.dumps(user, sort_keys=True, default=str).encode()).hexdigest()
+
+# Session methods for the uncached (write) verbs
+_WRITE_METHODS = {"POST": _SESSION.post, "PUT": _SESSION.put, "DELETE": _SESSION.delete}
+
 def make_api_request(endpoint: str, method: str = "GET", data: Dict = None, files=None, headers: Dict = None):
     """Make API request with error handling"""
     url = f"{API_BASE_URL}{endpoint}"
     
     try:
         if method == "GET":
-            response = requests.get(url, headers=headers)
-        elif method == "POST":
-            if files:
-                response = requests.post(url, data=data, files=files, headers=headers)
-            else:
-                response = requests.post(url, json=data, headers=headers)
-        elif method == "PUT":
-            response = requests.put(url, json=data, headers=headers)
-        elif method == "DELETE":
-            response = requests.delete(url, headers=headers)
-        else:
+            # Reads are cached per endpoint and token; writes below never are
+            return _cached_get(
+                endpoint, (headers or {}).get("Authorization"), st.session_state.cache_version
+            )
+        send = _WRITE_METHODS.get(method)
+        if send is None:
             return None
         
-        if response.status_code == 200:
+        kwargs = {"headers": headers, "timeout": API_TIMEOUT}
+        if files:
+            kwargs["data"] = data
+            kwargs["files"] = files
+        elif data is not None:
+            kwargs["json"] = data
+        response = send(url, **kwargs)
+        
+        if response.ok:
             return response.json()
-        else:
-            try:
-                payload = response.json()
-            except Exception:
-                payload = {"detail": response.text}
-            # Return structured error to caller so it can handle flow (e.g., switch to login)
-            return {"status_code": response.status_code, **payload}
-    except Exception as e:
+        # Return structured error to caller so it can handle flow (e.g., switch to login)
+        return {"status_code": response.status_code, **_error_payload(response)}
+    except _ApiError as e:
+        return {"status_code": e.status_code, **e.payload}
+    except requests.RequestException as e:
+        # Also covers an unparseable success body (requests' JSONDecodeError)
+        st.error(f"Connection error: {str(e)}")
+        return None
+
+# Long-lived workers for concurrent GETs; they share the pooled _SESSION
+_FETCH_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="api-fetch")
+
+def _run_in_ctx(ctx, fn, *args) -> Dict:
+    """Run a cached GET helper on a worker thread under the calling script's context"""
+    add_script_run_ctx(threading.current_thread(), ctx)
+    return fn(*args)
+
+def fetch_many(calls: Dict[str, tuple]) -> Dict[str, Optional[Dict]]:
+    """Run GET helpers concurrently; each call is (function, *args), results keep the keys"""
+    ctx = get_script_run_ctx()
+    futures = {
+        name: _FETCH_POOL.submit(_run_in_ctx, ctx, *call)
+        for name, call in calls.items()
+    }
+    
+    # Results are unpacked here so UI calls stay on the script thread
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except _ApiError as e:
+            results[name] = {"status_code": e.status_code, **e.payload}
+        except requests.RequestException as e:
+            st.error(f"Connection error: {str(e)}")
+            results[name] = None
+    return results
+
+def resume_files(uploaded_file) -> Dict:
+    """Multipart payload for a resume, handing requests the upload buffer itself"""
+    # A previous rerun may have read the buffer already; rewind instead of copying it
+    uploaded_file.seek(0)
+    return {'file': (uploaded_file.name, uploaded_file, uploaded_file.type)}
+
+# In memory only, bounded and short-lived: parsed resumes are personal data
+@st.cache_data(ttl=600, max_entries=128, show_spinner=False)
+def _parse_resume_cached(file_hash: str, name: str, mime: str, _data: bytes) -> Dict:
+    """POST a resume to /parse_resume; results are reused briefly, keyed by content hash"""
+    # _data is left out of the cache key (leading underscore); file_hash stands in for it
+    response = _SESSION.post(
+        f"{API_BASE_URL}/parse_resume",
+        files={'file': (name, _data, mime)},
+        timeout=API_TIMEOUT
+    )
+    if not response.ok:
+        raise _ApiError(response.status_code, _error_payload(response))
+    return response.json()
+
+def parse_resume(uploaded_file) -> Optional[Dict]:
+    """Parse a resume without auth, reusing the result for identical files"""
+    data = uploaded_file.getvalue()
+    file_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+    try:
+        return _parse_resume_cached(file_hash, uploaded_file.name, uploaded_file.type, data)
+    except _ApiError as e:
+        return {"status_code": e.status_code, **e.payload}
+    except requests.RequestException as e:
         st.error(f"Connection error: {str(e)}")
         return None
 
+def set_token(token: Optional[str]):
+    """Store the session token together with its prebuilt auth headers"""
+    st.session_state.token = token
+    st.session_state._auth_headers = {"Authorization": f"Bearer {token}"} if token else None
+
 def get_auth_headers():
     """Get authorization headers with token"""
-    if st.session_state.token:
-        return {"Authorization": f"Bearer {st.session_state.token}"}
-    return {}
+    return st.session_state.get('_auth_headers') or {}
 
 def save_internship(internship_id: int) -> bool:
     """Mark an internship as interested via API"""
@@ -218,6 +245,9 @@ def save_internship(internship_id: int) -> bool:
         method="POST",
         headers=get_auth_headers()
     )
+    # Saved list and recommendation cards (is_saved) change with this
+    invalidate_user_cache()
+    st.session_state.saved_dirty = True
     return bool(result and result.get("success"))
 
 def unsave_internship(internship_id: int) -> bool:
@@ -227,8 +257,38 @@ def unsave_internship(internship_id: int) -> bool:
         method="DELETE",
         headers=get_auth_headers()
     )
+    # Saved list and recommendation cards (is_saved) change with this
+    invalidate_user_cache()
+    st.session_state.saved_dirty = True
     return bool(result and result.get("success"))
 
+def render_login_form(form_key: str):
+    """Login form, prefilled with the email from a signup redirect if any"""
+    with st.form(form_key):
+        default_login_email = st.session_state.get('prefill_login_email', '')
+        email = st.text_input("Email", value=default_login_email, placeholder="your@email.com")
+        password = st.text_input("Password", type="password")
+        
+        if st.form_submit_button("Login", type="primary"):
+            if email and password:
+                result = make_api_request(
+                    "/auth/login",
+                    method="POST",
+                    data={"email": email, "password": password}
+                )
+                
+                if result and result.get('success'):
+                    set_token(result['token'])
+                    st.session_state.user = result['user']
+                    st.session_state.page = 'dashboard'
+                    # Clear prefill and the forced view once used
+                    st.session_state.prefill_login_email = ''
+                    st.session_state.force_show_login = False
+                    st.success("Login successful!")
+                    st.rerun()
+            else:
+                st.error("Please enter both email and password")
+
 def login_page():
     """Login/Registration page"""
     st.title("🎯 PM Internship Recommendation Engine")
@@ -240,27 +300,7 @@ def login_page():
         # If we need to force-show login view (e.g., after signup detects existing user)
         if st.session_state.get('force_show_login', False):
             st.warning("User already exists. Please log in.")
-            with st.form("login_form_forced"):
-                default_login_email = st.session_state.get('prefill_login_email', '')
-                email = st.text_input("Email", value=default_login_email, placeholder="your@email.com")
-                password = st.text_input("Password", type="password")
-                if st.form_submit_button("Login", type="primary"):
-                    if email and password:
-                        result = make_api_request(
-                            "/auth/login",
-                            method="POST",
-                            data={"email": email, "password": password}
-                        )
-                        if result and result.get('success'):
-                            st.session_state.token = result['token']
-                            st.session_state.user = result['user']
-                            st.session_state.page = 'dashboard'
-                            st.session_state.prefill_login_email = ''
-                            st.session_state.force_show_login = False
-                            st.success("Login successful!")
-                            st.rerun()
-                    else:
-                        st.error("Please enter both email and password")
+            render_login_form("login_form_forced")
             # Do not render tabs when forced view is active
             return
         
@@ -268,30 +308,7 @@ def login_page():
         
         with tab1:
             st.markdown("#### Welcome Back!")
-            with st.form("login_form"):
-                # Optional prefill from signup redirect
-                default_login_email = st.session_state.get('prefill_login_email', '')
-                email = st.text_input("Email", value=default_login_email, placeholder="your@email.com")
-                password = st.text_input("Password", type="password")
-                
-                if st.form_submit_button("Login", type="primary"):
-                    if email and password:
-                        result = make_api_request(
-                            "/auth/login",
-                            method="POST",
-                            data={"email": email, "password": password}
-                        )
-                        
-                        if result and result.get('success'):
-                            st.session_state.token = result['token']
-                            st.session_state.user = result['user']
-                            st.session_state.page = 'dashboard'
-                            st.success("Login successful!")
-                            # Clear prefill once used
-                            st.session_state.prefill_login_email = ''
-                            st.rerun()
-                    else:
-                        st.error("Please enter both email and password")
+            render_login_form("login_form")
         
         with tab2:
             st.markdown("#### Create Your Account")
@@ -306,20 +323,14 @@ def login_page():
             
             if uploaded_file and st.button("🔍 Parse Resume & Auto-fill", type="primary"):
                 with st.spinner("Parsing your resume..."):
-                    files = {'file': (uploaded_file.name, uploaded_file, uploaded_file.type)}
-                    result = make_api_request("/parse_resume", method="POST", files=files)
+                    result = parse_resume(uploaded_file)
                     
                     if result and result.get('success'):
                         parsed_data = result['parsed_data']
                         # Update session state with parsed data
-                        st.session_state.signup_name = parsed_data.get('name', '')
-                        st.session_state.signup_email = parsed_data.get('email', '')
-                        st.session_state.signup_education = parsed_data.get('education', '')
-                        st.session_state.signup_location = parsed_data.get('location', '')
-                        st.session_state.signup_phone = parsed_data.get('phone', '')
-                        st.session_state.signup_skills = parsed_data.get('skills', '')
-                        st.session_state.signup_linkedin = parsed_data.get('linkedin', '')
-                        st.session_state.signup_github = parsed_data.get('github', '')
+                        st.session_state.update({
+                            key: parsed_data.get(key[len('signup_'):], '') for key in _SIGNUP_KEYS
+                        })
                         st.success("✅ Resume parsed successfully! Form has been auto-filled below.")
                         st.rerun()
                     else:
@@ -338,9 +349,8 @@ def login_page():
                 with col2:
                     education = st.selectbox(
                         "Education",
-                        ["", "High School", "Diploma", "Bachelor's", "Master's", "PhD"],
-                        index=["", "High School", "Diploma", "Bachelor's", "Master's", "PhD"].index(st.session_state.signup_education)
-                        if st.session_state.signup_education in ["", "High School", "Diploma", "Bachelor's", "Master's", "PhD"] else 0
+                        _EDU_SIGNUP,
+                        index=_EDU_SIGNUP_IDX.get(st.session_state.signup_education, 0)
                     )
                     location = st.text_input("Location", value=st.session_state.signup_location, placeholder="e.g., Bangalore")
                     phone = st.text_input("Phone", value=st.session_state.signup_phone, placeholder="9876543210")
@@ -386,7 +396,7 @@ def login_page():
                             )
                             
                             if result and result.get('success'):
-                                st.session_state.token = result['token']
+                                set_token(result['token'])
                                 st.session_state.user = result['user']
                                 st.session_state.page = 'dashboard'
                                 st.success("Registration successful! Welcome aboard!")
@@ -397,13 +407,7 @@ def login_page():
                                 detail = result.get('detail') if isinstance(result, dict) else None
                                 if status == 400 and detail and 'already exists' in str(detail).lower():
                                     # Blank out signup form state
-                                    st.session_state.signup_name = ''
-                                    st.session_state.signup_email = ''
-                                    st.session_state.signup_linkedin = ''
-                                    st.session_state.signup_github = ''
-                                    st.session_state.signup_location = ''
-                                    st.session_state.signup_phone = ''
-                                    st.session_state.signup_skills = ''
+                                    st.session_state.update(dict.fromkeys(_SIGNUP_KEYS, ''))
                                     # Switch to login with prefilled email and a visible warning
                                     st.session_state.prefill_login_email = email
                                     st.session_state.force_show_login = True
@@ -414,8 +418,30 @@ def login_page():
                     else:
                         st.error("Please fill in all required fields (marked with *)")
 
+@lru_cache(maxsize=256)
+def info_bar_html(education: str, location: str, skills_count: int, exp_years: int) -> str:
+    """Dashboard info bar as a single HTML element, reused while the profile is unchanged"""
+    chips = (
+        ("Profile", education),
+        ("Location", location),
+        ("Skills", skills_count),
+        ("Experience", f"{exp_years} years"),
+    )
+    return '<div class="info-bar">' + ''.join(
+        f'<div class="info-chip"><b>{label}:</b> {html.escape(str(value))}</div>'
+        for label, value in chips
+    ) + '</div>'
+
 def dashboard_page():
     """Main dashboard with profile and recommendations"""
+    # Profile fields shown in both the sidebar and the info bar
+    user = st.session_state.user
+    skills_raw = user.get('skills') or ''
+    skills_count = skills_raw.count(',') + 1 if skills_raw else 0
+    location = user.get('location', 'Not set')
+    exp_years = user.get('experience_years', 0)
+    education = user.get('education', 'Not set')
+    
     # Sidebar (reverted to original simple layout)
     with st.sidebar:
         # User section with inline edit button
@@ -423,14 +449,14 @@ def dashboard_page():
         with user_container:
             col1, col2 = st.columns([5, 1])
             with col1:
-                st.markdown(f"## 👤 {st.session_state.user['name']}")
+                st.markdown(f"## 👤 {user['name']}")
             with col2:
                 # Small edit button with just icon
                 if st.button("✏️", key="edit_profile", help="Edit Profile"):
                     st.session_state.page = 'profile'
                     st.rerun()
             
-            st.markdown(f"📧 {st.session_state.user['email']}")
+            st.markdown(f"📧 {user['email']}")
         
         st.markdown("---")
         
@@ -451,63 +477,44 @@ def dashboard_page():
         
         col1, col2 = st.columns(2)
         with col1:
-            skills_count = len(st.session_state.user.get('skills', '').split(',')) if st.session_state.user.get('skills') else 0
             st.metric("Skills", skills_count)
         with col2:
-            exp_years = st.session_state.user.get('experience_years', 0)
             st.metric("Experience", f"{exp_years} yrs")
         
-        location = st.session_state.user.get('location', 'Not set')
         st.metric("📍 Location", location)
         
         # Add space before logout
-        st.markdown("<br>" * 15, unsafe_allow_html=True)
+        st.markdown('<div class="sidebar-spacer"></div>', unsafe_allow_html=True)
         
         # Logout button at the bottom
         st.markdown("---")
         logout_container = st.container()
         with logout_container:
             if st.button("🚪 **Logout**", key="logout_btn", use_container_width=True):
-                st.session_state.token = None
+                set_token(None)
                 st.session_state.user = None
                 st.session_state.page = 'login'
                 st.session_state.recommendations = None
+                st.session_state.saved_dirty = True
                 # Clear all signup form fields
-                st.session_state.signup_name = ''
-                st.session_state.signup_education = ''
-                st.session_state.signup_location = ''
-                st.session_state.signup_phone = ''
-                st.session_state.signup_skills = ''
-                st.session_state.signup_email = ''
-                st.session_state.signup_linkedin = ''
-                st.session_state.signup_github = ''
+                st.session_state.update(dict.fromkeys(_SIGNUP_KEYS, ''))
                 st.rerun()
     
     # Main content area
     st.title("🎯 Your PM Internship Dashboard")
     
     # Welcome message
-    hour = datetime.now().hour
-    greeting = "Good morning" if hour < 12 else "Good afternoon" if hour < 17 else "Good evening"
-    st.markdown(f"### {greeting}, {st.session_state.user['name']}! 👋")
+    greeting = _GREETINGS[datetime.now().hour]
+    st.markdown(f"### {greeting}, {user['name']}! 👋")
     
     # Quick actions bar
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.info(f"**Profile:** {st.session_state.user.get('education', 'Not set')}")
-    with col2:
-        st.info(f"**Location:** {st.session_state.user.get('location', 'Not set')}")
-    with col3:
-        skills_count = len(st.session_state.user.get('skills', '').split(',')) if st.session_state.user.get('skills') else 0
-        st.info(f"**Skills:** {skills_count}")
-    with col4:
-        st.info(f"**Experience:** {st.session_state.user.get('experience_years', 0)} years")
+    st.markdown(info_bar_html(education, location, skills_count, exp_years), unsafe_allow_html=True)
     
     # Recommendations section
     st.markdown("## 📋 Your Personalized Recommendations")
     
     if st.session_state.recommendations:
-        display_recommendations(st.session_state.recommendations)
+        recommendations_fragment()
     else:
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
@@ -540,12 +547,10 @@ def profile_page():
             if uploaded_file is not None:
                 if st.button("Parse Resume", type="primary"):
                     with st.spinner("Parsing your resume..."):
-                        files = {'file': (uploaded_file.name, uploaded_file, uploaded_file.type)}
-                        
                         result = make_api_request(
                             "/candidates/upload_resume",
                             method="POST",
-                            files=files,
+                            files=resume_files(uploaded_file),
                             headers=get_auth_headers()
                         )
                         
@@ -595,10 +600,8 @@ def profile_page():
                 name = st.text_input("Full Name", key="prof_name")
                 education = st.selectbox(
                     "Education",
-                    ["High School", "Diploma", "Bachelor's", "Master's", "PhD"],
-                    index=["High School", "Diploma", "Bachelor's", "Master's", "PhD"].index(
-                        st.session_state.get('prof_education', "Bachelor's")
-                    ) if st.session_state.get('prof_education', "Bachelor's") in ["High School", "Diploma", "Bachelor's", "Master's", "PhD"] else 2,
+                    _EDU_PROFILE,
+                    index=_EDU_PROFILE_IDX.get(st.session_state.get('prof_education', "Bachelor's"), 2),
                     key="prof_education"
                 )
                 location = st.text_input("Location", key="prof_location")
@@ -657,6 +660,8 @@ def profile_page():
                     )
                     
                     if result and result.get('success'):
+                        # Cached reads (recommendations, saved list) reflect the old profile
+                        invalidate_user_cache()
                         # Update session state with the new profile data
                         st.session_state.user = result['profile']
                         st.session_state.profile_data = result['profile']
@@ -680,26 +685,34 @@ def profile_page():
         st.markdown("### Profile Preview")
         preview_container = st.container()
         with preview_container:
-            st.info(f"**Name:** {name if 'name' in locals() else default_data.get('name', 'Not set')}")
-            st.info(f"**Education:** {education if 'education' in locals() else default_data.get('education', 'Not set')}")
-            st.info(f"**Location:** {location if 'location' in locals() else default_data.get('location', 'Not set')}")
-            st.info(f"**Experience:** {experience if 'experience' in locals() else default_data.get('experience_years', 0)} years")
+            # The form widgets above always run, so preview their current values directly
+            st.info(f"**Name:** {name}")
+            st.info(f"**Education:** {education}")
+            st.info(f"**Location:** {location}")
+            st.info(f"**Experience:** {experience} years")
             
-            if skills if 'skills' in locals() else default_data.get('skills'):
+            if skills:
                 st.markdown("**Skills:**")
-                skills_list = (skills if 'skills' in locals() else default_data.get('skills', '')).split(',')
-                for skill in skills_list[:10]:
-                    if skill.strip():
-                        st.success(f"✓ {skill.strip()}")
+                # Split and strip in one pass; stop after the first ten non-empty skills
+                for skill in islice(filter(None, _SKILL_SPLIT_RE.split(skills.strip())), 10):
+                    st.success(f"✓ {skill}")
 
 def fetch_recommendations():
     """Fetch recommendations from API"""
     with st.spinner("Analyzing your profile and finding perfect matches..."):
-        result = make_api_request(
-            "/recommendations",
-            method="GET",
-            headers=get_auth_headers()
-        )
+        # Load the saved list alongside so "View Interests" opens from cache.
+        # A profile update already bumped the cache version (and changed the hash).
+        authorization = get_auth_headers().get("Authorization")
+        version = st.session_state.cache_version
+        results = fetch_many({
+            "recommendations": (_cached_recommendations, profile_hash(st.session_state.user), authorization, version),
+            "saved": (_cached_get, "/saved-internships", authorization, version),
+        })
+        result = results["recommendations"]
+        saved = results["saved"]
+        if saved and saved.get('success'):
+            st.session_state.saved_internships = saved.get('internships', [])
+            st.session_state.saved_dirty = False
         
         if result and result.get('success'):
             st.session_state.recommendations = result['recommendations']
@@ -708,12 +721,49 @@ def fetch_recommendations():
             st.success(f"Found {len(result['recommendations'])} great matches for you!")
             st.rerun()
 
+def paginate(items: List[Dict], state_key: str) -> Tuple[List[Dict], int]:
+    """Current page of items and its start index, with Prev/Next controls when needed"""
+    pages = max(1, -(-len(items) // PAGE_SIZE))
+    page = min(st.session_state.get(state_key, 0), pages - 1)
+    
+    if pages > 1:
+        prev_col, info_col, next_col = st.columns([1, 4, 1])
+        with prev_col:
+            if st.button("← Prev", key=f"{state_key}_prev", disabled=page == 0):
+                page -= 1
+        with next_col:
+            if st.button("Next →", key=f"{state_key}_next", disabled=page >= pages - 1):
+                page += 1
+        with info_col:
+            st.caption(f"Page {page + 1} of {pages} · {len(items)} internships")
+    
+    st.session_state[state_key] = page
+    start = page * PAGE_SIZE
+    return items[start:start + PAGE_SIZE], start
+
+def _esc(value) -> str:
+    """HTML-escape a value for cards rendered with unsafe_allow_html"""
+    return html.escape(str(value))
+
+def skill_list_html(heading: str, skills: Optional[List[str]]) -> str:
+    """Heading plus up to five skill bullets, or nothing when there are no skills"""
+    if not skills:
+        return ''
+    items = ''.join(f'<p class="card-caption">• {_esc(skill)}</p>' for skill in skills[:5])
+    return f'<p><b>{heading}</b></p>{items}'
+
+@st.fragment
+def recommendations_fragment():
+    """Recommendation cards; their buttons rerun only this fragment"""
+    display_recommendations(st.session_state.recommendations)
+
 def display_recommendations(recommendations: List[Dict]):
-    """Display recommendation cards"""
+    """Display recommendation cards (rendered inside recommendations_fragment)"""
     if not recommendations:
         st.info("No recommendations found. Try updating your profile with more skills!")
         return
     
+    # The API returns at most the top few matches, so this list is not paginated
     for idx, rec in enumerate(recommendations):
         # Create a card-like container
         with st.container():
@@ -724,10 +774,9 @@ def display_recommendations(recommendations: List[Dict]):
                 # Extract numeric percentage and intensity for color
                 match_text = rec.get('match_percentage', '')
                 # Expect formats like "🟢 82% match", "🟡 58% match", "🔴 35% match"
-                import re
-                m = re.search(r"(\d+)%", match_text)
+                m = _MATCH_PCT_RE.search(match_text)
                 percent = m.group(1) if m else "--"
-                level = 'high' if '🟢' in match_text else 'medium' if '🟡' in match_text else 'low'
+                level = _MATCH_LEVELS.get(match_text[:1], 'low')
                 st.markdown(
                     f"""
                     <div class="match-box {level}">
@@ -739,40 +788,31 @@ def display_recommendations(recommendations: List[Dict]):
                 )
             
             with middle:
-                st.markdown(f"### {rec['title']}")
-                
-                # Company info in one line
-                st.markdown(f"**🏢 {rec['company']}** | 📍 {rec['location']} | ⏱️ {rec['duration']}")
-                
-                # Stipend only (match moved to left box)
-                st.info(f"💰 Stipend: {rec['stipend']}")
+                # Title, company line and stipend (match moved to left box)
+                st.markdown(
+                    f'<h3>{_esc(rec["title"])}</h3>'
+                    f'<p><b>🏢 {_esc(rec["company"])}</b> | 📍 {_esc(rec["location"])} | ⏱️ {_esc(rec["duration"])}</p>'
+                    f'<div class="info-chip">💰 Stipend: {_esc(rec["stipend"])}</div>',
+                    unsafe_allow_html=True
+                )
                 
                 # Description
                 with st.expander("📋 Description", expanded=False):
                     st.write(rec['description'])
                 
-                # Skills in two columns
-                skill_col1, skill_col2 = st.columns(2)
-                
-                with skill_col1:
-                    if rec.get('matched_skills'):
-                        st.markdown("**✅ Your Matching Skills:**")
-                        for skill in rec['matched_skills'][:5]:
-                            st.caption(f"• {skill}")
-                
-                with skill_col2:
-                    if rec.get('skill_gaps'):
-                        st.markdown("**📚 Skills to Learn:**")
-                        for skill in rec['skill_gaps'][:5]:
-                            st.caption(f"• {skill}")
-                
-                # Why it matches
+                # Skills in two columns, then why it matches
+                body = (
+                    '<div class="skills-grid">'
+                    f'<div>{skill_list_html("✅ Your Matching Skills:", rec.get("matched_skills"))}</div>'
+                    f'<div>{skill_list_html("📚 Skills to Learn:", rec.get("skill_gaps"))}</div>'
+                    '</div>'
+                )
                 if rec.get('explanation'):
-                    st.info(f"💡 {rec['explanation']}")
+                    body += f'<div class="info-chip">💡 {_esc(rec["explanation"])}</div>'
+                st.markdown(body, unsafe_allow_html=True)
             
-            with right:
-                st.markdown("<br>", unsafe_allow_html=True)
-                st.markdown("<br>", unsafe_allow_html=True)
+            # Keyed container gets the st-key-card_actions_* class (top padding in app.css)
+            with right.container(key=f"card_actions_{idx}"):
                 if st.button("Apply Now", key=f"apply_{idx}", type="primary", use_container_width=True):
                     st.balloons()
                     st.success("Great choice! Application feature coming soon!")
@@ -782,11 +822,13 @@ def display_recommendations(recommendations: List[Dict]):
                 if is_saved:
                     if st.button("❌ Not Interested", key=f"unsave_{idx}", use_container_width=True):
                         if unsave_internship(rec.get('internship_id')):
-                            st.rerun()
+                            rec['is_saved'] = False
+                            st.rerun(scope="fragment")
                 else:
                     if st.button("💚 Interested", key=f"save_{idx}", use_container_width=True):
                         if save_internship(rec.get('internship_id')):
-                            st.rerun()
+                            rec['is_saved'] = True
+                            st.rerun(scope="fragment")
             
             st.divider()
 
@@ -796,32 +838,36 @@ def display_saved_internships(saved_internships: List[Dict]):
         st.info("No Interests shown!")
         return
     
-    for idx, internship in enumerate(saved_internships):
+    visible, start = paginate(saved_internships, 'saved_list_page')
+    for idx, internship in enumerate(visible, start):
         with st.container():
             col1, col2 = st.columns([5, 1])
             
             with col1:
-                st.markdown(f"### {internship['title']}")
-                st.markdown(f"**🏢 {internship['company']}** | 📍 {internship['location']}")
-                st.markdown(f"**Duration:** {internship.get('duration', 'Not specified')} | **Stipend:** ₹{internship.get('stipend', 'Not specified')}")
-                
+                header = (
+                    f'<h3>{_esc(internship["title"])}</h3>'
+                    f'<p><b>🏢 {_esc(internship["company"])}</b> | 📍 {_esc(internship["location"])}</p>'
+                    f'<p><b>Duration:</b> {_esc(internship.get("duration", "Not specified"))} | '
+                    f'<b>Stipend:</b> ₹{_esc(internship.get("stipend", "Not specified"))}</p>'
+                )
                 # When marked as interested
                 saved_date = internship.get('saved_at', '')
                 if saved_date:
-                    st.caption(f"💚 Marked interested on: {saved_date[:10]}")
+                    header += f'<p class="card-caption">💚 Marked interested on: {_esc(saved_date[:10])}</p>'
+                st.markdown(header, unsafe_allow_html=True)
                 
                 with st.expander("📋 Description"):
                     st.write(internship.get('description', 'No description available'))
                 
                 # Skills required
                 if internship.get('required_skills'):
-                    st.markdown("**Required Skills:**")
-                    st.caption(internship['required_skills'])
+                    st.markdown(
+                        f'<p><b>Required Skills:</b></p>'
+                        f'<p class="card-caption">{_esc(internship["required_skills"])}</p>',
+                        unsafe_allow_html=True
+                    )
             
-            with col2:
-                st.markdown("<br>", unsafe_allow_html=True)
-                st.markdown("<br>", unsafe_allow_html=True)
-                
+            with col2.container(key=f"card_actions_saved_{idx}"):
                 if st.button("Apply", key=f"apply_saved_{idx}", type="primary", use_container_width=True):
                     st.success("Application feature coming soon!")
                 
@@ -831,13 +877,26 @@ def display_saved_internships(saved_internships: List[Dict]):
             
             st.divider()
 
+@st.cache_resource(show_spinner=False)
+def ensure_seeded() -> bool:
+    """POST /seed_data once; the result is shared by every session in this process"""
+    result = make_api_request("/seed_data", method="POST")
+    if not (result and result.get('success')):
+        # Raising keeps a failed attempt out of the cache
+        raise RuntimeError("Seeding the API failed")
+    return True
+
 # Main app logic
 def main():
     """Main application"""
-    # Initialize API (seed data if needed)
-    if 'initialized' not in st.session_state:
-        make_api_request("/seed_data", method="POST")
-        st.session_state.initialized = True
+    # Initialize API (seed data if needed): once per Streamlit process on success,
+    # at most once per session while the API is failing
+    if not st.session_state.get('seed_attempted'):
+        st.session_state.seed_attempted = True
+        try:
+            ensure_seeded()
+        except RuntimeError:
+            pass  # Not cached, so the next session retries
     
     # Route to appropriate page
     if st.session_state.token is None:
@@ -861,6 +920,7 @@ def fetch_saved_internships():
         )
         if result and result.get('success'):
             st.session_state.saved_internships = result.get('internships', [])
+            st.session_state.saved_dirty = False
             st.session_state.page = 'saved'
             st.success(f"Loaded {len(st.session_state.saved_internships)} interests")
             st.rerun()
@@ -871,14 +931,19 @@ def saved_page():
         st.session_state.page = 'dashboard'
         st.rerun()
     st.title("💚 Your Interested Internships")
-    # Always fetch fresh list so removals reflect immediately
-    result = make_api_request(
-        "/saved-internships",
-        method="GET",
-        headers=get_auth_headers()
-    )
-    saved_list = result.get('internships', []) if result and result.get('success') else []
-    display_saved_internships(saved_list)
+    # Refetch only after a save/unsave so removals reflect immediately
+    if st.session_state.get('saved_dirty', True):
+        result = make_api_request(
+            "/saved-internships",
+            method="GET",
+            headers=get_auth_headers()
+        )
+        if result and result.get('success'):
+            st.session_state.saved_internships = result.get('internships', [])
+            st.session_state.saved_dirty = False
+        else:
+            st.session_state.saved_internships = []
+    display_saved_internships(st.session_state.saved_internships)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
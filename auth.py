@@ -3,26 +3,122 @@ Authentication Module - JWT-based authentication system
 """
 import jwt
 import bcrypt
-from datetime import datetime, timedelta
+import base64
+import json
+import os
+import time
+import heapq
+import hashlib
+import hmac
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, Optional, Tuple
 import logging
 from database import Database
 from utils import Utils
 
+try:
+    # Optional argon2id backend (pip install argon2-cffi)
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerificationError, InvalidHashError
+except ImportError:
+    PasswordHasher = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# bcrypt work factor; each +1 doubles hashing time. Tune per deployment hardware.
+BCRYPT_COST = int(os.getenv("BCRYPT_COST", "12"))
+# Hash used for new passwords: "bcrypt" or "argon2". Either kind verifies.
+PASSWORD_KDF = os.getenv("PASSWORD_KDF", "bcrypt")
+
+def _b64url_decode(segment: str) -> bytes:
+    """Decode an unpadded base64url JWT segment"""
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+@lru_cache(maxsize=8)
+def _hs256_key(secret_key: str):
+    """HMAC-SHA256 state keyed with the secret, prepared once and copied per token"""
+    return hmac.new(secret_key.encode('utf-8'), digestmod=hashlib.sha256)
+
+def _decode_hs256(token: str, secret_key: str) -> Optional[Dict]:
+    """Verify a plain HS256 JWT directly; returns None to defer to PyJWT"""
+    try:
+        header_b64, payload_b64, signature_b64 = token.split('.')
+        header = json.loads(_b64url_decode(header_b64))
+        if header.get('alg') != 'HS256' or 'crit' in header:
+            return None
+        
+        mac = _hs256_key(secret_key).copy()
+        mac.update(f"{header_b64}.{payload_b64}".encode('ascii'))
+        if not hmac.compare_digest(mac.digest(), _b64url_decode(signature_b64)):
+            raise jwt.InvalidSignatureError("Signature verification failed")
+        payload = json.loads(_b64url_decode(payload_b64))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise jwt.DecodeError(f"Invalid token: {e}")
+    
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError("Invalid payload")
+    now = time.time()
+    if 'exp' in payload and float(payload['exp']) <= now:
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    if 'nbf' in payload and float(payload['nbf']) > now:
+        raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+    return payload
+
+def _decode_token(token: str, secret_key: str, algorithm: str) -> Dict:
+    """Decode and verify a JWT (api.py caches successful verifications by token digest)"""
+    # Our own tokens are HS256: verify them with a precomputed HMAC key and
+    # fall back to PyJWT for anything else
+    if algorithm == 'HS256':
+        payload = _decode_hs256(token, secret_key)
+        if payload is not None:
+            return payload
+    return jwt.decode(token, secret_key, algorithms=[algorithm])
+
 class AuthManager:
-    def __init__(self, secret_key: str = None):
+    def __init__(self, secret_key: str = None, bcrypt_rounds: int = None, kdf: str = None,
+                 db: Database = None):
         """Initialize authentication manager"""
         self.secret_key = secret_key or "your-secret-key-change-in-production-2024"
         self.algorithm = "HS256"
         self.token_expiry_hours = 24
-        self.db = Database()
+        self.bcrypt_rounds = bcrypt_rounds or BCRYPT_COST
+        self.argon2_hasher = (
+            PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1) if PasswordHasher else None
+        )
+        
+        kdf = kdf or PASSWORD_KDF
+        if kdf not in ('bcrypt', 'argon2'):
+            raise ValueError(f"Unsupported password KDF: {kdf!r} (expected 'bcrypt' or 'argon2')")
+        if kdf == 'argon2' and not self.argon2_hasher:
+            # Refuse to quietly hash with a different KDF than the one configured
+            raise RuntimeError("PASSWORD_KDF=argon2 requires argon2-cffi (pip install argon2-cffi)")
+        self.kdf = kdf
+        self._hash = self.hash_password_argon2 if kdf == 'argon2' else self.hash_password_bcrypt
+        self.db = db or Database()
+    
+    def benchmark_bcrypt(self) -> float:
+        """Time one hash at the configured cost and warn if it is out of range"""
+        start = time.perf_counter()
+        self.hash_password_bcrypt("benchmark-password")
+        elapsed = time.perf_counter() - start
+        
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms < 100:
+            logger.warning("bcrypt cost %d hashes in %.0f ms; consider raising BCRYPT_COST",
+                           self.bcrypt_rounds, elapsed_ms)
+        elif elapsed_ms > 500:
+            logger.warning("bcrypt cost %d hashes in %.0f ms; consider lowering BCRYPT_COST",
+                           self.bcrypt_rounds, elapsed_ms)
+        else:
+            logger.info("bcrypt cost %d hashes in %.0f ms", self.bcrypt_rounds, elapsed_ms)
+        return elapsed
     
     def hash_password_bcrypt(self, password: str) -> str:
         """Hash password using bcrypt"""
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self.bcrypt_rounds)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
@@ -30,29 +126,58 @@ class AuthManager:
         """Verify password against bcrypt hash"""
         return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
     
+    def hash_password_argon2(self, password: str) -> str:
+        """Hash password using argon2id"""
+        return self.argon2_hasher.hash(password)
+    
+    def verify_password_argon2(self, password: str, hashed: str) -> bool:
+        """Verify password against argon2 hash"""
+        if not self.argon2_hasher:
+            logger.error("Cannot verify argon2 hash: argon2-cffi is not installed")
+            return False
+        try:
+            return self.argon2_hasher.verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    def hash_password(self, password: str) -> str:
+        """Hash password with the configured KDF"""
+        return self._hash(password)
+    
+    def verify_password(self, password: str, hashed: str) -> bool:
+        """Verify password against a bcrypt or argon2 hash, chosen by its prefix"""
+        if hashed.startswith('$argon2'):
+            return self.verify_password_argon2(password, hashed)
+        return self.verify_password_bcrypt(password, hashed)
+    
     def generate_token(self, user_id: int, email: str) -> str:
         """Generate JWT token for authenticated user"""
+        now = datetime.now(timezone.utc)
         payload = {
             'user_id': user_id,
             'email': email,
-            'exp': datetime.utcnow() + timedelta(hours=self.token_expiry_hours),
-            'iat': datetime.utcnow()
+            'exp': now + timedelta(hours=self.token_expiry_hours),
+            'iat': now
         }
         
         token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
-        logger.info(f"Generated token for user {email}")
+        logger.info("Generated token for user %s", email)
         return token
     
     def verify_token(self, token: str) -> Optional[Dict]:
         """Verify and decode JWT token"""
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
+            payload = _decode_token(token, self.secret_key, self.algorithm)
+            # The cache has no TTL, so re-check expiry on every hit
+            if payload.get('exp', 0) <= time.time():
+                logger.warning("Token has expired")
+                return None
+            return dict(payload)
         except jwt.ExpiredSignatureError:
             logger.warning("Token has expired")
             return None
         except jwt.InvalidTokenError as e:
-            logger.warning(f"Invalid token: {e}")
+            logger.warning("Invalid token: %s", e)
             return None
     
     def register_user(self, user_data: Dict) -> Tuple[bool, str, Optional[int]]:
@@ -68,7 +193,7 @@ class AuthManager:
             return False, "Invalid email format", None
         
         # Check if user already exists
-        existing_user = self.db.get_candidate(email=user_data['email'])
+        existing_user = self.db.get_auth_row(email=user_data['email'])
         if existing_user:
             return False, "User with this email already exists", None
         
@@ -78,7 +203,7 @@ class AuthManager:
             return False, "Password must be at least 6 characters long", None
         
         # Hash password
-        user_data['password_hash'] = self.hash_password_bcrypt(password)
+        user_data['password_hash'] = self.hash_password(password)
         del user_data['password']  # Remove plain password
         
         # Validate optional fields
@@ -95,7 +220,7 @@ class AuthManager:
         user_id = self.db.add_candidate(user_data)
         
         if user_id:
-            logger.info(f"Successfully registered user: {user_data['email']}")
+            logger.info("Successfully registered user: %s", user_data['email'])
             return True, "Registration successful", user_id
         else:
             return False, "Failed to register user", None
@@ -106,16 +231,21 @@ class AuthManager:
         if not Utils.validate_email(email):
             return False, "Invalid email format", None, None
         
-        # Get user from database
-        user = self.db.get_candidate(email=email)
+        # Check the password against the narrow auth row first
+        auth_row = self.db.get_auth_row(email=email)
         
-        if not user:
+        if not auth_row:
             return False, "User not found", None, None
         
         # Verify password
-        if not self.verify_password_bcrypt(password, user['password_hash']):
+        if not self.verify_password(password, auth_row['password_hash']):
             return False, "Invalid password", None, None
         
+        # Only now load the full profile for the response
+        user = self.db.get_candidate(candidate_id=auth_row['id'])
+        if not user:
+            return False, "User not found", None, None
+        
         # Generate token
         token = self.generate_token(user['id'], user['email'])
         
@@ -133,19 +263,19 @@ class AuthManager:
             'github': user.get('github')
         }
         
-        logger.info(f"User {email} logged in successfully")
+        logger.info("User %s logged in successfully", email)
         return True, "Login successful", token, user_data
     
     def update_password(self, user_id: int, old_password: str, new_password: str) -> Tuple[bool, str]:
         """Update user password"""
         # Get user from database
-        user = self.db.get_candidate(candidate_id=user_id)
+        user = self.db.get_auth_row(candidate_id=user_id)
         
         if not user:
             return False, "User not found"
         
         # Verify old password
-        if not self.verify_password_bcrypt(old_password, user['password_hash']):
+        if not self.verify_password(old_password, user['password_hash']):
             return False, "Invalid current password"
         
         # Validate new password
@@ -153,13 +283,13 @@ class AuthManager:
             return False, "New password must be at least 6 characters long"
         
         # Hash new password
-        new_password_hash = self.hash_password_bcrypt(new_password)
+        new_password_hash = self.hash_password(new_password)
         
         # Update in database
-        success = self.db.update_candidate(user_id, {'password_hash': new_password_hash})
+        success = self.db.update_password_hash(user_id, new_password_hash)
         
         if success:
-            logger.info(f"Password updated for user {user_id}")
+            logger.info("Password updated for user %s", user_id)
             return True, "Password updated successfully"
         else:
             return False, "Failed to update password"
@@ -167,23 +297,24 @@ class AuthManager:
     def reset_password_request(self, email: str) -> Tuple[bool, str, Optional[str]]:
         """Generate password reset token"""
         # Check if user exists
-        user = self.db.get_candidate(email=email)
+        user = self.db.get_auth_row(email=email)
         
         if not user:
             return False, "User not found", None
         
         # Generate reset token with short expiry
+        now = datetime.now(timezone.utc)
         payload = {
             'user_id': user['id'],
             'email': user['email'],
             'type': 'password_reset',
-            'exp': datetime.utcnow() + timedelta(hours=1),
-            'iat': datetime.utcnow()
+            'exp': now + timedelta(hours=1),
+            'iat': now
         }
         
         reset_token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
         
-        logger.info(f"Password reset token generated for {email}")
+        logger.info("Password reset token generated for %s", email)
         return True, "Reset token generated", reset_token
     
     def reset_password_confirm(self, reset_token: str, new_password: str) -> Tuple[bool, str]:
@@ -207,13 +338,13 @@ class AuthManager:
             return False, "Password must be at least 6 characters long"
         
         # Hash new password
-        new_password_hash = self.hash_password_bcrypt(new_password)
+        new_password_hash = self.hash_password(new_password)
         
         # Update in database
-        success = self.db.update_candidate(user_id, {'password_hash': new_password_hash})
+        success = self.db.update_password_hash(user_id, new_password_hash)
         
         if success:
-            logger.info(f"Password reset successful for user {user_id}")
+            logger.info("Password reset successful for user %s", user_id)
             return True, "Password reset successful"
         else:
             return False, "Failed to reset password"
@@ -225,7 +356,14 @@ class AuthManager:
         if not payload:
             return None
         
-        user_id = payload.get('user_id')
+        return self.get_user_from_payload(payload)
+    
+    def get_user_from_payload(self, payload: Dict) -> Optional[Dict]:
+        """Get user data for an already verified token payload"""
+        return self.get_user(payload.get('user_id'))
+    
+    def get_user(self, user_id: int) -> Optional[Dict]:
+        """Get user data without sensitive fields"""
         user = self.db.get_candidate(candidate_id=user_id)
         
         if user:
@@ -258,47 +396,65 @@ class AuthManager:
             payload.get('email')
         )
         
-        logger.info(f"Token refreshed for user {payload.get('email')}")
+        logger.info("Token refreshed for user %s", payload.get('email'))
         return new_token
 
 # Session Manager for maintaining user sessions
 class SessionManager:
-    def __init__(self):
+    def __init__(self, auth_manager: AuthManager = None, max_sessions: int = 10000):
         """Initialize session manager"""
-        self.sessions = {}  # In-memory session store
-        self.auth_manager = AuthManager()
+        # In-memory session store, least recently used first; bounded by max_sessions
+        self.sessions = OrderedDict()
+        self.max_sessions = max_sessions
+        self.session_ttl = 24 * 3600  # seconds
+        # Min-heap of (monotonic expiry, session_id); destroyed sessions are skipped lazily
+        self._expiry_heap = []
+        self.auth_manager = auth_manager or AuthManager()
     
     def create_session(self, token: str, user_data: Dict) -> str:
         """Create a new session"""
         session_id = Utils.generate_random_string(32)
+        # Age checks use the monotonic clock; the datetime is kept for display only
+        now = time.monotonic()
         self.sessions[session_id] = {
             'token': token,
             'user_data': user_data,
-            'created_at': datetime.utcnow(),
-            'last_activity': datetime.utcnow()
+            'created_at': datetime.now(timezone.utc),
+            'created_mono': now,
+            'last_activity_mono': now
         }
+        heapq.heappush(self._expiry_heap, (now + self.session_ttl, session_id))
+        
+        # Evict least recently used sessions past the cap
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+        # Evicted sessions leave stale heap entries; rebuild if they pile up
+        if len(self._expiry_heap) > 2 * self.max_sessions:
+            self._expiry_heap = [
+                (s['created_mono'] + self.session_ttl, sid) for sid, s in self.sessions.items()
+            ]
+            heapq.heapify(self._expiry_heap)
         return session_id
     
     def get_session(self, session_id: str) -> Optional[Dict]:
         """Get session data"""
+        # Expire due sessions first (amortized; usually nothing to pop)
+        self.cleanup_expired_sessions()
         session = self.sessions.get(session_id)
         
         if not session:
             return None
         
-        # Check if session is expired (24 hours)
-        if datetime.utcnow() - session['created_at'] > timedelta(hours=24):
-            del self.sessions[session_id]
-            return None
-        
         # Update last activity
-        session['last_activity'] = datetime.utcnow()
+        session['last_activity_mono'] = time.monotonic()
         
         # Verify token is still valid
         if not self.auth_manager.verify_token(session['token']):
             del self.sessions[session_id]
             return None
         
+        # Mark as most recently used so active sessions survive eviction
+        self.sessions.move_to_end(session_id)
         return session
     
     def destroy_session(self, session_id: str) -> bool:
@@ -310,18 +466,16 @@ class SessionManager:
     
     def cleanup_expired_sessions(self):
         """Clean up expired sessions"""
-        current_time = datetime.utcnow()
-        expired_sessions = []
+        current_time = time.monotonic()
+        removed = 0
         
-        for session_id, session in self.sessions.items():
-            if current_time - session['created_at'] > timedelta(hours=24):
-                expired_sessions.append(session_id)
-        
-        for session_id in expired_sessions:
-            del self.sessions[session_id]
+        while self._expiry_heap and self._expiry_heap[0][0] <= current_time:
+            _, session_id = heapq.heappop(self._expiry_heap)
+            if self.sessions.pop(session_id, None) is not None:
+                removed += 1
         
-        if expired_sessions:
-            logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
+        if removed:
+            logger.info("Cleaned up %d expired sessions", removed)
 
 # Testing
 if __name__ == "__main__":
@@ -362,7 +516,7 @@ if __name__ == "__main__":
             print(f"Token valid: {payload is not None}")
             
             # Test session management
-            session_mgr = SessionManager()
+            session_mgr = SessionManager(auth_manager=auth)
             session_id = session_mgr.create_session(token, user_data)
             print(f"Session created: {session_id[:10]}...")
             
@@ -21,11 +21,12 @@ def cleanup_database():
         removed = db.remove_duplicate_internships()
         print(f"  ✅ Removed {removed} duplicate entries")
         
-        # Get stats after cleanup
-        print("\n📊 Database After Cleanup:")
-        stats = db.get_internship_stats()
-        print(f"  Total internships: {stats['total']}")
-        print(f"  Duplicate groups: {stats['duplicate_groups']}")
+        # Get stats after cleanup (unchanged if nothing was removed)
+        if removed:
+            print("\n📊 Database After Cleanup:")
+            stats = db.get_internship_stats()
+            print(f"  Total internships: {stats['total']}")
+            print(f"  Duplicate groups: {stats['duplicate_groups']}")
     else:
         print("\n✅ No duplicates found - database is clean!")
     
@@ -1,29 +1,278 @@
 """Database Module - Handles SQLite database operations"""
 import sqlite3
-import json
-import hashlib
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+import orjson
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Dict, Optional, Set, Tuple
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class Database:
-    def __init__(self, db_path: str = "recommendation_engine.db"):
-        """Initialize database connection"""
-        self.db_path = db_path
-        self.init_db()
+CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout = 30000",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",  # 64 MiB
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+)
+
+# Hot-path statements. sqlite3 caches prepared statements per connection keyed
+# by SQL text, so keeping each query in one place guarantees cache hits.
+_SQL_GET_CANDIDATE_BY_EMAIL = 'SELECT * FROM candidates WHERE email = ?'
+_SQL_GET_CANDIDATE_BY_ID = 'SELECT * FROM candidates WHERE id = ?'
+_SQL_GET_AUTH_BY_EMAIL = 'SELECT id, email, password_hash FROM candidates WHERE email = ? LIMIT 1'
+_SQL_GET_AUTH_BY_ID = 'SELECT id, email, password_hash FROM candidates WHERE id = ? LIMIT 1'
+_SQL_GET_INTERNSHIP_BY_ID = 'SELECT * FROM internships WHERE id = ?'
+_SQL_SAVE_REC_CACHE = '''
+    INSERT OR REPLACE INTO rec_cache (candidate_id, payload, created_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+'''
+_SQL_CACHED_RECS = 'SELECT payload FROM rec_cache WHERE candidate_id = ? AND created_at >= ?'
+_SQL_INSERT_SAVED = 'INSERT INTO saved_internships (candidate_id, internship_id) VALUES (?, ?)'
+_SQL_DELETE_SAVED = 'DELETE FROM saved_internships WHERE candidate_id = ? AND internship_id = ?'
+# Only the fields the saved list renders; every joined row is saved by definition
+_SQL_SAVED_INTERNSHIPS = '''
+    SELECT i.id, i.title, i.company, i.location, i.description,
+           i.required_skills, i.preferred_skills, i.duration, i.stipend,
+           s.saved_at, 1 AS is_saved
+    FROM saved_internships s
+    JOIN internships i ON s.internship_id = i.id
+    WHERE s.candidate_id = ?
+    ORDER BY s.saved_at DESC
+'''
+# Existence probe on the UNIQUE(candidate_id, internship_id) index
+_SQL_IS_SAVED = 'SELECT 1 FROM saved_internships WHERE candidate_id = ? AND internship_id = ? LIMIT 1'
+_SQL_SAVED_IDS = 'SELECT internship_id FROM saved_internships WHERE candidate_id = ?'
+
+_SQL_CREATE_REC_CACHE = '''
+    CREATE TABLE IF NOT EXISTS rec_cache (
+        candidate_id INTEGER PRIMARY KEY,
+        payload BLOB NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+_SQL_CREATE_META = '''
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+'''
+
+# Catalog change counter: triggers bump it on every insert/update/delete of an
+# internship, whichever process or script makes the change
+_SQL_INIT_CATALOG_VERSION = "INSERT OR IGNORE INTO meta (key, value) VALUES ('catalog_version', '0')"
+_SQL_CATALOG_TRIGGERS = tuple(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_internships_{op.lower()} AFTER {op} ON internships
+    BEGIN
+        UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'catalog_version';
+    END
+''' for op in ('INSERT', 'UPDATE', 'DELETE'))
+_SQL_CATALOG_VERSION = "SELECT value FROM meta WHERE key = 'catalog_version'"
+
+# Label for the groups get_internship_stats folds together past its top_n
+OTHER_GROUP = '(other)'
+
+# Bump when run_cleanup_and_migration gains a step existing databases must run
+SCHEMA_VERSION = 1
+# Seconds between automatic duplicate sweeps at startup
+DEDUPE_INTERVAL = 24 * 3600
+
+# Profile columns a candidate may change; identity and credentials go through
+# dedicated methods (update_password_hash)
+_CANDIDATE_UPDATABLE = frozenset({
+    'name', 'education', 'skills', 'location', 'experience_years',
+    'phone', 'linkedin', 'github'
+})
+
+@lru_cache(maxsize=256)
+def _candidate_update_sql(fields: Tuple[str, ...], returning: bool = False) -> str:
+    """SQL for updating the given (whitelisted, sorted) candidate columns"""
+    assignments = ', '.join(f"{field} = ?" for field in fields)
+    query = f"UPDATE candidates SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+    return query + " RETURNING *" if returning else query
+
+_INTERNSHIP_COLUMNS = frozenset({
+    'id', 'title', 'company', 'location', 'description', 'required_skills',
+    'preferred_skills', 'duration', 'stipend', 'application_deadline',
+    'posted_date', 'is_active', 'min_education', 'experience_required'
+})
+
+def _utc_cutoff(**delta) -> str:
+    """UTC timestamp `delta` ago, formatted like SQLite's CURRENT_TIMESTAMP"""
+    # Comparing the raw column against this keeps created_at indexes usable
+    return (datetime.now(timezone.utc) - timedelta(**delta)).strftime('%Y-%m-%d %H:%M:%S')
+
+class PooledConnection:
+    """Proxy around a pooled sqlite3 connection; close() returns it to the pool"""
     
-    def get_connection(self):
-        """Get database connection with sane defaults for concurrency"""
-        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+    def __init__(self, pool: 'ConnectionPool', conn: sqlite3.Connection, created_at: float):
+        self._pool = pool
+        self._conn = conn
+        self._created_at = created_at
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def close(self):
+        """Hand the underlying connection back to the pool"""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool.release(conn, self._created_at)
+    
+    def __del__(self):
+        # Never leak a pool slot if a caller forgot to close (e.g. on exceptions)
         try:
-            conn.execute("PRAGMA busy_timeout = 30000")
+            self.close()
         except Exception:
             pass
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections with pre-ping and recycling"""
+    
+    def __init__(self, db_path: str, pool_size: int = 5, max_overflow: int = 10,
+                 pool_timeout: float = 30, pool_recycle: int = 3600,
+                 pool_pre_ping: bool = True):
+        self.db_path = db_path
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.pool_pre_ping = pool_pre_ping
+        # Idle connections beyond pool_size (the overflow) are closed on release
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+        self._slots = threading.BoundedSemaphore(pool_size + max_overflow)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with sane defaults for concurrency"""
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False,
+                               cached_statements=256)
+        # Rows support both index and name access; dict(row) takes names from SQLite
+        conn.row_factory = sqlite3.Row
+        # Per-connection tuning: with WAL, NORMAL sync only fsyncs at checkpoints.
+        # foreign_keys stays off: duplicate cleanup deletes internships that
+        # saved/recommendation rows may still reference.
+        for pragma in CONNECTION_PRAGMAS:
+            try:
+                conn.execute(pragma)
+            except sqlite3.Error:
+                pass
         return conn
     
+    def _is_usable(self, conn: sqlite3.Connection, created_at: float) -> bool:
+        """Check recycle age and optionally ping the connection"""
+        if self.pool_recycle >= 0 and time.monotonic() - created_at > self.pool_recycle:
+            return False
+        if self.pool_pre_ping:
+            try:
+                conn.execute("SELECT 1")
+            except sqlite3.Error:
+                return False
+        return True
+    
+    def acquire(self) -> PooledConnection:
+        """Check out a connection, waiting up to pool_timeout for a free slot"""
+        if not self._slots.acquire(timeout=self.pool_timeout):
+            raise sqlite3.OperationalError(
+                f"Connection pool limit reached, timed out after {self.pool_timeout}s"
+            )
+        try:
+            while True:
+                try:
+                    conn, created_at = self._idle.get_nowait()
+                except queue.Empty:
+                    conn, created_at = self._connect(), time.monotonic()
+                    break
+                if self._is_usable(conn, created_at):
+                    break
+                conn.close()
+        except Exception:
+            self._slots.release()
+            raise
+        return PooledConnection(self, conn, created_at)
+    
+    def release(self, conn: sqlite3.Connection, created_at: float):
+        """Return a connection to the pool, discarding any uncommitted work"""
+        try:
+            conn.rollback()
+            self._idle.put_nowait((conn, created_at))
+        except (sqlite3.Error, queue.Full):
+            conn.close()
+        finally:
+            self._slots.release()
+    
+    def dispose(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                # Let SQLite refresh planner statistics it found lacking
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            conn.close()
+
+class Database:
+    # One pool per database file, shared by every Database instance in the process
+    _pools: Dict[str, ConnectionPool] = {}
+    _pools_lock = threading.Lock()
+    # Database files already initialized by this process
+    _bootstrapped: Set[str] = set()
+    
+    def __init__(self, db_path: str = "recommendation_engine.db",
+                 pool_size: int = 5, max_overflow: int = 10,
+                 pool_timeout: float = 30, pool_recycle: int = 3600):
+        """Initialize database connection pool"""
+        self.db_path = db_path
+        # Full-catalog results keyed by (active_only, columns), validated by a freshness probe
+        self._internships_cache: Dict[Tuple, Tuple[str, List[Dict]]] = {}
+        self._internships_lock = threading.Lock()
+        self.pool = self._shared_pool(
+            db_path,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle
+        )
+        # Schema setup and cleanup run once per database file per process
+        key = self._path_key(db_path)
+        if key not in Database._bootstrapped:
+            self.init_db()
+            Database._bootstrapped.add(key)
+    
+    @staticmethod
+    def _path_key(db_path: str) -> str:
+        """Normalize a database path for the per-process registries"""
+        return db_path if db_path == ":memory:" else os.path.abspath(db_path)
+    
+    @classmethod
+    def _shared_pool(cls, db_path: str, **pool_options) -> ConnectionPool:
+        """Return the process-wide pool for db_path, creating it on first use"""
+        key = cls._path_key(db_path)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls._pools[key] = ConnectionPool(db_path, **pool_options)
+            return pool
+    
+    @classmethod
+    def dispose_pools(cls):
+        """Close idle connections in every shared pool (registered with atexit)"""
+        with cls._pools_lock:
+            for pool in cls._pools.values():
+                pool.dispose()
+    
+    def get_connection(self):
+        """Check out a pooled connection; close() returns it to the pool"""
+        return self.pool.acquire()
+    
     def init_db(self):
         """Initialize database tables"""
         conn = self.get_connection()
@@ -33,6 +282,11 @@ class Database:
             cursor.execute("PRAGMA journal_mode=WAL;")
         except Exception:
             pass
+        # Startup statistics pass, cheap on an already analyzed database
+        try:
+            cursor.execute("PRAGMA optimize=0x10002;")
+        except Exception:
+            pass
         
         # Create candidates table
         cursor.execute('''
@@ -94,7 +348,8 @@ class Database:
             )
         ''')
         
-        # Create recommendations table for caching
+        # Legacy per-row recommendation cache, superseded by rec_cache. Nothing writes it;
+        # it is kept (unindexed) so older databases open and the clear_* methods still purge it
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS recommendations (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -120,10 +375,35 @@ class Database:
                 FOREIGN KEY (internship_id) REFERENCES internships(id)
             )
         ''')
-        
+
+        # Indexes for the per-candidate lookups and the age-based cleanup.
+        # is_active is left unindexed: nearly every row is active.
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_saved_candidate_time
+            ON saved_internships(candidate_id, saved_at DESC)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_apps_candidate
+            ON applications(candidate_id)
+        ''')
+
+        # Ranked recommendation list per candidate, stored as one JSON payload
+        cursor.execute(_SQL_CREATE_REC_CACHE)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_rec_cache_created
+            ON rec_cache(created_at)
+        ''')
+
+        # Bookkeeping for run_cleanup_and_migration (schema_version, last_dedupe_at)
+        # and the catalog change counter get_all_internships' memo is keyed on
+        cursor.execute(_SQL_CREATE_META)
+        cursor.execute(_SQL_INIT_CATALOG_VERSION)
+        for trigger in _SQL_CATALOG_TRIGGERS:
+            cursor.execute(trigger)
+
         conn.commit()
         conn.close()
-        
+
         # Run cleanup and migration after table creation
         self.run_cleanup_and_migration()
         
@@ -200,18 +480,17 @@ class Database:
                     FOREIGN KEY (candidate_id) REFERENCES candidates(id),
                     FOREIGN KEY (internship_id) REFERENCES internships(id)
                 )
-            '''
+            ''',
+            'rec_cache': _SQL_CREATE_REC_CACHE,
+            'meta': _SQL_CREATE_META
         }
         conn = self.get_connection()
         cursor = conn.cursor()
+        # One lookup for the report, then the idempotent DDL as a single script
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
         existing = {row[0] for row in cursor.fetchall()}
-        created: List[str] = []
-        for name, ddl in expected_tables.items():
-            if name not in existing:
-                cursor.execute(ddl)
-                created.append(name)
-        conn.commit()
+        created = [name for name in expected_tables if name not in existing]
+        cursor.executescript(';'.join(expected_tables.values()))
         conn.close()
         return created
     
@@ -221,41 +500,43 @@ class Database:
         attempts = 3
         while attempts > 0:
             try:
-                with open(json_path, 'r') as f:
-                    internships = json.load(f)
-                
                 conn = self.get_connection()
                 cursor = conn.cursor()
                 
-                # Skip seeding if internships already exist
-                cursor.execute('SELECT COUNT(*) FROM internships')
-                count_before = cursor.fetchone()[0]
-                if count_before > 0:
+                # Skip seeding (and parsing the file) if internships already exist
+                cursor.execute('SELECT EXISTS(SELECT 1 FROM internships)')
+                if cursor.fetchone()[0]:
                     conn.close()
                     logger.info("Internships already present, skipping seeding")
                     return True
+                
+                with open(json_path, 'rb') as f:
+                    internships = orjson.loads(f.read())
 
-                for internship in internships:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO internships 
-                        (title, company, location, description, required_skills, 
-                         preferred_skills, duration, stipend, min_education, experience_required)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        internship.get('title'),
-                        internship.get('company'),
-                        internship.get('location'),
-                        internship.get('description'),
-                        internship.get('required_skills'),
-                        internship.get('preferred_skills'),
-                        internship.get('duration'),
-                        internship.get('stipend'),
-                        internship.get('min_education', 'Bachelor'),
-                        internship.get('experience_required', 0)
-                    ))
+                rows = [(
+                    internship.get('title'),
+                    internship.get('company'),
+                    internship.get('location'),
+                    internship.get('description'),
+                    internship.get('required_skills'),
+                    internship.get('preferred_skills'),
+                    internship.get('duration'),
+                    internship.get('stipend'),
+                    internship.get('min_education', 'Bachelor'),
+                    internship.get('experience_required', 0)
+                ) for internship in internships]
                 
+                # One write transaction for the whole batch; the unique index drops duplicates
+                cursor.execute('BEGIN IMMEDIATE')
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO internships 
+                    (title, company, location, description, required_skills, 
+                     preferred_skills, duration, stipend, min_education, experience_required)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
                 conn.commit()
                 conn.close()
+                self.invalidate_internships_cache()
                 logger.info(f"Seeded {len(internships)} internships")
                 return True
             except sqlite3.OperationalError as e:
@@ -280,6 +561,7 @@ class Database:
                 (email, password_hash, name, education, skills, location, 
                  experience_years, phone, linkedin, github)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
             ''', (
                 candidate_data['email'],
                 candidate_data['password_hash'],
@@ -292,9 +574,9 @@ class Database:
                 candidate_data.get('linkedin'),
                 candidate_data.get('github')
             ))
-            
+            # Read the RETURNING row before committing so the statement is finished
+            candidate_id = cursor.fetchone()[0]
             conn.commit()
-            candidate_id = cursor.lastrowid
             conn.close()
             logger.info(f"Added candidate {candidate_id}")
             return candidate_id
@@ -313,9 +595,9 @@ class Database:
         cursor = conn.cursor()
         
         if email:
-            cursor.execute('SELECT * FROM candidates WHERE email = ?', (email,))
+            cursor.execute(_SQL_GET_CANDIDATE_BY_EMAIL, (email,))
         elif candidate_id:
-            cursor.execute('SELECT * FROM candidates WHERE id = ?', (candidate_id,))
+            cursor.execute(_SQL_GET_CANDIDATE_BY_ID, (candidate_id,))
         else:
             conn.close()
             return None
@@ -323,36 +605,70 @@ class Database:
         row = cursor.fetchone()
         conn.close()
         
-        if row:
-            columns = ['id', 'email', 'password_hash', 'name', 'education', 
-                      'skills', 'location', 'experience_years', 'phone', 
-                      'linkedin', 'github', 'created_at', 'updated_at']
-            return dict(zip(columns, row))
-        return None
+        return dict(row) if row else None
     
-    def update_candidate(self, candidate_id: int, update_data: Dict) -> bool:
-        """Update candidate information"""
+    def get_auth_row(self, email: str = None, candidate_id: int = None) -> Optional[Dict]:
+        """Get only the columns needed to check a candidate's password"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Build update query dynamically
-        update_fields = []
-        values = []
-        for key, value in update_data.items():
-            if key not in ['id', 'email', 'password_hash', 'created_at']:
-                update_fields.append(f"{key} = ?")
-                values.append(value)
+        if email:
+            cursor.execute(_SQL_GET_AUTH_BY_EMAIL, (email,))
+        elif candidate_id:
+            cursor.execute(_SQL_GET_AUTH_BY_ID, (candidate_id,))
+        else:
+            conn.close()
+            return None
+        
+        row = cursor.fetchone()
+        conn.close()
+        
+        return dict(row) if row else None
+    
+    def update_password_hash(self, candidate_id: int, password_hash: str) -> bool:
+        """Set a candidate's password hash (excluded from update_candidate on purpose)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
         
-        if not update_fields:
+        try:
+            cursor.execute(
+                'UPDATE candidates SET password_hash = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?',
+                (password_hash, candidate_id)
+            )
+            conn.commit()
+            updated = cursor.rowcount > 0
+            conn.close()
+            return updated
+        except Exception as e:
+            logger.error(f"Error updating password hash: {e}")
             conn.close()
             return False
+    
+    def _build_candidate_update(self, candidate_id: int, update_data: Dict,
+                                returning: bool = False) -> Tuple[Optional[str], List]:
+        """Build the dynamic UPDATE statement for a candidate; query is None if nothing to update"""
+        unknown = update_data.keys() - _CANDIDATE_UPDATABLE
+        if unknown:
+            raise ValueError(f"Cannot update candidate fields: {sorted(unknown)}")
+        
+        fields = tuple(sorted(update_data))
+        if not fields:
+            return None, []
         
+        values = [update_data[key] for key in fields]
         values.append(candidate_id)
-        query = f"UPDATE candidates SET {', '.join(update_fields)}, updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+        return _candidate_update_sql(fields, returning), values
+    
+    def update_candidate(self, candidate_id: int, update_data: Dict) -> bool:
+        """Update candidate information"""
+        query, values = self._build_candidate_update(candidate_id, update_data)
+        if not query:
+            return False
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
         
         try:
-            logger.info(f"Executing query: {query}")
-            logger.info(f"With values: {values}")
             cursor.execute(query, values)
             conn.commit()
             conn.close()
@@ -363,97 +679,143 @@ class Database:
             conn.close()
             return False
     
-    def get_all_internships(self, active_only: bool = True) -> List[Dict]:
-        """Get all internships"""
+    def update_candidate_returning(self, candidate_id: int, update_data: Dict) -> Optional[Dict]:
+        """Update candidate information and return the updated row in the same round-trip"""
+        query, values = self._build_candidate_update(candidate_id, update_data, returning=True)
+        if not query:
+            return None
+        
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        if active_only:
-            cursor.execute('SELECT * FROM internships WHERE is_active = 1')
+        try:
+            cursor.execute(query, values)
+            row = cursor.fetchone()
+            conn.commit()
+            conn.close()
+            logger.info(f"Updated candidate {candidate_id}")
+            return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"Error updating candidate: {e}")
+            conn.close()
+            return None
+    
+    def get_all_internships(self, active_only: bool = True,
+                            limit: Optional[int] = None, offset: int = 0,
+                            columns: Optional[Tuple[str, ...]] = None) -> List[Dict]:
+        """Get all internships, optionally one page at a time and only some columns"""
+        if columns:
+            unknown = set(columns) - _INTERNSHIP_COLUMNS
+            if unknown:
+                raise ValueError(f"Unknown internship columns: {sorted(unknown)}")
+            select = ', '.join(columns)
         else:
-            cursor.execute('SELECT * FROM internships')
+            select = '*'
         
-        rows = cursor.fetchall()
+        where = ' WHERE is_active = 1' if active_only else ''
+        query = f'SELECT {select} FROM internships{where}'
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if limit is not None:
+            cursor.execute(query + ' ORDER BY id LIMIT ? OFFSET ?', (limit, offset))
+            rows = cursor.fetchall()
+            conn.close()
+            return [dict(row) for row in rows]
+        
+        # The catalog rarely changes: reuse the last full read while the trigger-maintained
+        # change counter is unchanged (catches in-place UPDATEs and writes by other
+        # processes). Cached dicts are shared between callers and must not be mutated.
+        cursor.execute(_SQL_CATALOG_VERSION)
+        row = cursor.fetchone()
+        version = row[0] if row else None
+        cache_key = (active_only, tuple(columns) if columns else None)
+        with self._internships_lock:
+            cached = self._internships_cache.get(cache_key)
+        if version is not None and cached is not None and cached[0] == version:
+            conn.close()
+            return list(cached[1])
+        
+        cursor.execute(query)
+        internships = [dict(row) for row in cursor.fetchall()]
         conn.close()
         
-        columns = ['id', 'title', 'company', 'location', 'description', 
-                  'required_skills', 'preferred_skills', 'duration', 'stipend',
-                  'application_deadline', 'posted_date', 'is_active', 
-                  'min_education', 'experience_required']
+        if version is not None:
+            with self._internships_lock:
+                self._internships_cache[cache_key] = (version, internships)
+        return list(internships)
+    
+    def invalidate_internships_cache(self):
+        """Drop memoized get_all_internships results"""
+        with self._internships_lock:
+            self._internships_cache.clear()
+    
+    def count_internships(self, active_only: bool = True) -> int:
+        """Count internships without materializing rows"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        if active_only:
+            cursor.execute('SELECT COUNT(*) FROM internships WHERE is_active = 1')
+        else:
+            cursor.execute('SELECT COUNT(*) FROM internships')
         
-        return [dict(zip(columns, row)) for row in rows]
+        count = cursor.fetchone()[0]
+        conn.close()
+        return count
     
     def get_internship(self, internship_id: int) -> Optional[Dict]:
         """Get specific internship by ID"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM internships WHERE id = ?', (internship_id,))
+        cursor.execute(_SQL_GET_INTERNSHIP_BY_ID, (internship_id,))
         row = cursor.fetchone()
         conn.close()
         
-        if row:
-            columns = ['id', 'title', 'company', 'location', 'description', 
-                      'required_skills', 'preferred_skills', 'duration', 'stipend',
-                      'application_deadline', 'posted_date', 'is_active', 
-                      'min_education', 'experience_required']
-            return dict(zip(columns, row))
-        return None
-    
-    def save_recommendation(self, candidate_id: int, internship_id: int, 
-                           score: float, explanation: str):
-        """Save recommendation for caching"""
+        return dict(row) if row else None
+    
+    def save_recommendations(self, candidate_id: int, entries: List[Dict]) -> bool:
+        """Cache a candidate's ranked recommendations as a single JSON payload"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                INSERT INTO recommendations 
-                (candidate_id, internship_id, score, explanation)
-                VALUES (?, ?, ?, ?)
-            ''', (candidate_id, internship_id, score, explanation))
-            
+            # Scores may be NumPy scalars coming out of the scorer
+            payload = orjson.dumps(entries, option=orjson.OPT_SERIALIZE_NUMPY)
+            cursor.execute(_SQL_SAVE_REC_CACHE, (candidate_id, payload))
             conn.commit()
             conn.close()
             return True
         except Exception as e:
-            logger.error(f"Error saving recommendation: {e}")
+            logger.error(f"Error saving recommendations: {e}")
             conn.close()
             return False
     
     def get_cached_recommendations(self, candidate_id: int, hours: int = 24) -> List[Dict]:
-        """Get cached recommendations within specified hours"""
+        """Get cached recommendations within specified hours, best first"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT r.*, i.title, i.company, i.location, i.description, 
-                   i.required_skills, i.preferred_skills, i.duration, i.stipend
-            FROM recommendations r
-            JOIN internships i ON r.internship_id = i.id
-            WHERE r.candidate_id = ? 
-            AND datetime(r.created_at) >= datetime('now', '-' || ? || ' hours')
-            ORDER BY r.score DESC
-        ''', (candidate_id, hours))
+        cursor.execute(_SQL_CACHED_RECS, (candidate_id, _utc_cutoff(hours=hours)))
         
-        rows = cursor.fetchall()
+        row = cursor.fetchone()
         conn.close()
         
-        columns = ['id', 'candidate_id', 'internship_id', 'score', 'explanation', 
-                  'created_at', 'title', 'company', 'location', 'description',
-                  'required_skills', 'preferred_skills', 'duration', 'stipend']
-        
-        return [dict(zip(columns, row)) for row in rows]
+        return orjson.loads(row[0]) if row else []
     
     def clear_old_recommendations(self, days: int = 7):
         """Clear recommendations older than specified days"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        cutoff = _utc_cutoff(days=days)
+        cursor.execute('DELETE FROM rec_cache WHERE created_at < ?', (cutoff,))
         cursor.execute('''
             DELETE FROM recommendations 
-            WHERE datetime(created_at) < datetime('now', '-' || ? || ' days')
-        ''', (days,))
+            WHERE created_at < ?
+        ''', (cutoff,))
         
         conn.commit()
         conn.close()
@@ -464,6 +826,7 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        cursor.execute('DELETE FROM rec_cache WHERE candidate_id = ?', (candidate_id,))
         cursor.execute('''
             DELETE FROM recommendations 
             WHERE candidate_id = ?
@@ -479,10 +842,7 @@ class Database:
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                INSERT INTO saved_internships (candidate_id, internship_id)
-                VALUES (?, ?)
-            ''', (candidate_id, internship_id))
+            cursor.execute(_SQL_INSERT_SAVED, (candidate_id, internship_id))
             
             conn.commit()
             conn.close()
@@ -503,10 +863,7 @@ class Database:
         cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                DELETE FROM saved_internships 
-                WHERE candidate_id = ? AND internship_id = ?
-            ''', (candidate_id, internship_id))
+            cursor.execute(_SQL_DELETE_SAVED, (candidate_id, internship_id))
             
             conn.commit()
             rows_affected = cursor.rowcount
@@ -526,104 +883,148 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT i.*, s.saved_at,
-                   CASE WHEN s.id IS NOT NULL THEN 1 ELSE 0 END as is_saved
-            FROM saved_internships s
-            JOIN internships i ON s.internship_id = i.id
-            WHERE s.candidate_id = ?
-            ORDER BY s.saved_at DESC
-        ''', (candidate_id,))
+        cursor.execute(_SQL_SAVED_INTERNSHIPS, (candidate_id,))
         
         rows = cursor.fetchall()
         conn.close()
         
-        columns = ['id', 'title', 'company', 'location', 'description', 
-                  'required_skills', 'preferred_skills', 'duration', 'stipend',
-                  'application_deadline', 'posted_date', 'is_active', 
-                  'min_education', 'experience_required', 'saved_at', 'is_saved']
-        
-        return [dict(zip(columns, row)) for row in rows]
+        return [dict(row) for row in rows]
     
     def is_internship_saved(self, candidate_id: int, internship_id: int) -> bool:
         """Check if an internship is saved by user"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT COUNT(*) FROM saved_internships 
-            WHERE candidate_id = ? AND internship_id = ?
-        ''', (candidate_id, internship_id))
+        cursor.execute(_SQL_IS_SAVED, (candidate_id, internship_id))
         
-        count = cursor.fetchone()[0]
+        saved = cursor.fetchone() is not None
         conn.close()
         
-        return count > 0
+        return saved
+
+    def get_saved_internship_ids(self, candidate_id: int) -> Set[int]:
+        """Get the ids of all internships saved by a candidate in one query"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(_SQL_SAVED_IDS, (candidate_id,))
+
+        saved_ids = {row[0] for row in cursor.fetchall()}
+        conn.close()
+
+        return saved_ids
 
     def remove_duplicate_internships(self) -> int:
         """Remove duplicate internships by title+company+location+description, keeping the first occurrence. Returns number removed."""
         conn = self.get_connection()
         cursor = conn.cursor()
+        # One statement; the GROUP BY walks idx_internships_unique (same columns).
+        # Take the write lock up front so the scan and delete see one snapshot.
+        cursor.execute('BEGIN IMMEDIATE')
         cursor.execute('''
-            SELECT title, company, location, description, COUNT(*) as cnt
-            FROM internships
-            GROUP BY title, company, location, description
-            HAVING COUNT(*) > 1
+            DELETE FROM internships
+            WHERE rowid NOT IN (
+                SELECT MIN(rowid) FROM internships
+                GROUP BY title, company, location, description
+            )
         ''')
-        duplicates = cursor.fetchall()
-        if not duplicates:
-            logger.info("No duplicate internships found")
-            conn.close()
-            return 0
-        removed = 0
-        for title, company, location, description, cnt in duplicates:
-            cursor.execute('''
-                DELETE FROM internships
-                WHERE rowid NOT IN (
-                    SELECT MIN(rowid) FROM internships 
-                    WHERE title = ? AND company = ? AND location = ? AND description = ?
-                ) AND title = ? AND company = ? AND location = ? AND description = ?
-            ''', (title, company, location, description, title, company, location, description))
-            removed += cnt - 1
+        removed = cursor.rowcount
         conn.commit()
         conn.close()
-        logger.info(f"Removed {removed} duplicate internships")
+        if removed:
+            self.invalidate_internships_cache()
+            logger.info(f"Removed {removed} duplicate internships")
+        else:
+            logger.info("No duplicate internships found")
         return removed
 
-    def get_internship_stats(self) -> Dict[str, Dict]:
-        """Get aggregate statistics about internships in the database."""
+    def table_row_counts(self) -> Dict[str, int]:
+        """Row count of every user table, in one UNION ALL query"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        stats: Dict[str, Dict] = {}
-        cursor.execute("SELECT COUNT(*) FROM internships")
-        stats['total'] = cursor.fetchone()[0]
-        cursor.execute('''
-            SELECT location, COUNT(*)
-            FROM internships
-            GROUP BY location
-        ''')
-        stats['by_location'] = dict(cursor.fetchall())
-        cursor.execute('''
-            SELECT company, COUNT(*)
-            FROM internships
-            GROUP BY company
-        ''')
-        stats['by_company'] = dict(cursor.fetchall())
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+        )
+        tables = [row[0] for row in cursor.fetchall()]
+        counts: Dict[str, int] = {}
+        if tables:
+            # Names come from sqlite_master, not user input
+            cursor.execute(' UNION ALL '.join(
+                f'SELECT \'{t}\', COUNT(*) FROM "{t}"' for t in tables
+            ))
+            counts = {name: count for name, count in cursor.fetchall()}
+        conn.close()
+        return counts
+
+    def get_internship_stats(self, top_n: int = 50) -> Dict[str, Dict]:
+        """Get aggregate statistics about internships in the database. Breakdowns keep the top_n
+        largest groups; the rest are summed under OTHER_GROUP and `truncated` is set, so each
+        breakdown still adds up to `total`."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        # All breakdowns in one round-trip, tagged by dimension
         cursor.execute('''
-            SELECT COUNT(*) FROM (
-                SELECT title, company
-                FROM internships
+            SELECT 'total', NULL, COUNT(*) FROM internships
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'location', location, COUNT(*) AS n FROM internships
+                GROUP BY location ORDER BY n DESC, location LIMIT ?
+            )
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'company', company, COUNT(*) AS n FROM internships
+                GROUP BY company ORDER BY n DESC, company LIMIT ?
+            )
+            UNION ALL
+            SELECT 'duplicate_groups', NULL, COUNT(*) FROM (
+                SELECT 1 FROM internships
                 GROUP BY title, company
                 HAVING COUNT(*) > 1
             )
-        ''')
-        stats['duplicate_groups'] = cursor.fetchone()[0]
+        ''', (top_n, top_n))
+        rows = cursor.fetchall()
         conn.close()
+        
+        stats: Dict[str, Dict] = {'by_location': {}, 'by_company': {}, 'duplicate_groups': 0, 'total': 0}
+        for dimension, key, count in rows:
+            if dimension == 'location':
+                stats['by_location'][key] = count
+            elif dimension == 'company':
+                stats['by_company'][key] = count
+            else:
+                stats[dimension] = count
+        
+        stats['truncated'] = False
+        for breakdown in (stats['by_location'], stats['by_company']):
+            remainder = stats['total'] - sum(breakdown.values())
+            if remainder > 0:
+                breakdown[OTHER_GROUP] = remainder
+                stats['truncated'] = True
         return stats
 
-    def run_cleanup_and_migration(self):
-        """Run cleanup and migration tasks automatically"""
+    @classmethod
+    def migrate(cls, db_path: str = "recommendation_engine.db") -> 'Database':
+        """Open db_path and run cleanup and migration unconditionally"""
+        db = cls(db_path)
+        db.run_cleanup_and_migration(force=True)
+        return db
+    
+    def _get_meta(self, cursor: sqlite3.Cursor) -> Dict[str, str]:
+        """All meta key/value pairs"""
+        cursor.execute('SELECT key, value FROM meta')
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    
+    def run_cleanup_and_migration(self, force: bool = False):
+        """Run cleanup and migration tasks; skipped while the schema is current and dedupe is recent"""
         try:
+            if not force:
+                conn = self.get_connection()
+                meta = self._get_meta(conn.cursor())
+                conn.close()
+                if (meta.get('schema_version') == str(SCHEMA_VERSION)
+                        and meta.get('last_dedupe_at', '') >= _utc_cutoff(seconds=DEDUPE_INTERVAL)):
+                    return
+            
             # Remove duplicates based on title + company + location + description
             removed = self.remove_duplicate_internships()
             if removed > 0:
@@ -633,10 +1034,22 @@ class Database:
             missing = self.ensure_all_tables()
             if missing:
                 logger.info(f"Created missing tables: {missing}")
+            
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.executemany(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                [('schema_version', str(SCHEMA_VERSION)), ('last_dedupe_at', _utc_cutoff())]
+            )
+            conn.commit()
+            conn.close()
                 
         except Exception as e:
             logger.error(f"Error during cleanup/migration: {e}")
 
+# Close pooled connections cleanly at interpreter exit
+atexit.register(Database.dispose_pools)
+
 # Initialize database on module import
 if __name__ == "__main__":
     db = Database()
@@ -649,12 +1062,5 @@ if __name__ == "__main__":
     print("Database initialized successfully with all tables:")
     
     # List all tables
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
-    for table in tables:
-        cursor.execute(f"SELECT COUNT(*) FROM {table[0]}")
-        count = cursor.fetchone()[0]
-        print(f"  - {table[0]}: {count} records")
-    conn.close()
\ No newline at end of file
+    for table, count in db.table_row_counts().items():
+        print(f"  - {table}: {count} records")
\ No newline at end of file
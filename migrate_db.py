@@ -7,7 +7,7 @@ def migrate_database():
     """Ensure database has all required tables and structure"""
     print("🔄 Starting database migration...")
     
-    db = Database()
+    db = Database.migrate()
     
     # Ensure all tables exist
     missing = db.ensure_all_tables()
@@ -18,19 +18,10 @@ def migrate_database():
         print("✅ All tables already exist")
     
     # Check current structure
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    
     print("\n📊 Database Status:")
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
-    
-    for table in tables:
-        cursor.execute(f"SELECT COUNT(*) FROM {table[0]}")
-        count = cursor.fetchone()[0]
-        print(f"  ✓ {table[0]}: {count} records")
+    for table, count in db.table_row_counts().items():
+        print(f"  ✓ {table}: {count} records")
     
-    conn.close()
     print("\n✅ Database migration complete!")
 
 if __name__ == "__main__":
@@ -2,9 +2,10 @@
 Recommendation Engine Module - Hybrid recommendation system with rule-based and ML approaches
 """
 import re
-from typing import List, Dict, Tuple, Set
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
+from functools import lru_cache
+from typing import List, Dict, Tuple, FrozenSet, Optional
+from sklearn.feature_extraction.text import HashingVectorizer
 import numpy as np
 import logging
 from database import Database
@@ -12,15 +13,43 @@ from database import Database
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Regions whose cities count as a partial location match; group id = list index
+_CITY_GROUPS = [
+    ['delhi', 'gurgaon', 'gurugram', 'noida', 'faridabad', 'ghaziabad', 'ncr'],  # NCR
+    ['mumbai', 'pune', 'nashik', 'nagpur'],  # Maharashtra
+    ['bangalore', 'bengaluru', 'mysore'],  # Karnataka
+    ['chennai', 'coimbatore', 'madurai'],  # Tamil Nadu
+    ['hyderabad', 'vijayawada', 'visakhapatnam'],  # Telangana/Andhra
+    ['kolkata', 'howrah', 'durgapur']  # West Bengal
+]
+_NCR_GROUP = 0
+_CITY_GROUP_ID = {city: gid for gid, cities in enumerate(_CITY_GROUPS) for city in cities}
+_CITY_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _CITY_GROUP_ID)) + r')\b')
+
+@lru_cache(maxsize=4096)
+def _norm(text: str) -> str:
+    """Lowercased, stripped form of a location / education string"""
+    return text.lower().strip() if text else ''
+
+@lru_cache(maxsize=4096)
+def _location_groups(location: str) -> FrozenSet[int]:
+    """Region ids of the known cities mentioned in a (lowercased) location"""
+    return frozenset(_CITY_GROUP_ID[city] for city in _CITY_RE.findall(location))
+
 class RecommendationEngine:
     def __init__(self, db: Database = None):
         """Initialize recommendation engine"""
         self.db = db or Database()
-        self.tfidf_vectorizer = TfidfVectorizer(
-            max_features=500,
+        # Stateless: no fit, rows come out L2-normalized so a dot product is the cosine
+        self.vectorizer = HashingVectorizer(
+            n_features=2 ** 14,
             stop_words='english',
-            ngram_range=(1, 2)
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm='l2'
         )
+        # (catalog key, internship matrix), swapped as one tuple so readers never see a mix
+        self._intern_vectors = (None, None)
         
         # Skill normalization dictionary
         self.skill_synonyms = {
@@ -68,6 +97,22 @@ class RecommendationEngine:
             'paas': 'platform as a service',
             'iaas': 'infrastructure as a service'
         }
+        # One alternation for every synonym, longest first so 'nodejs' wins over 'node'.
+        # Canonical forms map to themselves so 'node.js' is not re-expanded via 'node'/'js'.
+        self._syn_map = {full: full for full in self.skill_synonyms.values()}
+        self._syn_map.update(self.skill_synonyms)
+        self._syn_re = re.compile(
+            r'\b(' + '|'.join(re.escape(term) for term in sorted(self._syn_map, key=len, reverse=True)) + r')\b'
+        )
+        
+        # The same candidate and catalog strings are parsed for every internship and
+        # request; frozensets so cached values can't be mutated by callers
+        self._skill_set_cache = lru_cache(maxsize=4096)(self._parse_skill_set)
+        # Catalog skill -> bit index, assigned on first sight; overlap counts become int
+        # popcounts. Candidate skills never get bits, so the vocabulary stays catalog-sized
+        self._skill_bit = {}
+        self._skill_bit_lock = threading.Lock()
+        self._mask_cache = lru_cache(maxsize=4096)(self._build_mask)
         
         # Education level hierarchy
         self.education_hierarchy = {
@@ -95,26 +140,17 @@ class RecommendationEngine:
         if not skills_text:
             return ""
         
-        normalized = skills_text.lower()
-        
-        # Replace synonyms and abbreviations (sort by length descending to avoid partial replacements)
-        sorted_synonyms = sorted(self.skill_synonyms.items(), key=lambda x: len(x[0]), reverse=True)
-        for abbr, full in sorted_synonyms:
-            # Use word boundaries and avoid replacing within already replaced text
-            pattern = r'\b' + re.escape(abbr) + r'\b'
-            normalized = re.sub(pattern, full, normalized)
-        
-        # Clean up any double replacements
-        normalized = re.sub(r'\.javascript\.javascript', '.javascript', normalized)
-        normalized = re.sub(r'\.js\.js', '.js', normalized)
-        
-        return normalized
+        # Single pass over the text; replacements are never rescanned
+        return self._syn_re.sub(lambda m: self._syn_map[m.group(1)], skills_text.lower())
     
-    def extract_skill_set(self, skills_text: str) -> Set[str]:
-        """Extract individual skills from skills text"""
+    def extract_skill_set(self, skills_text: str) -> FrozenSet[str]:
+        """Extract individual skills from skills text (memoized on the raw string)"""
         if not skills_text:
-            return set()
-        
+            return frozenset()
+        return self._skill_set_cache(skills_text)
+    
+    def _parse_skill_set(self, skills_text: str) -> FrozenSet[str]:
+        """Uncached body of extract_skill_set"""
         # Normalize first
         normalized = self.normalize_skills(skills_text)
         
@@ -128,32 +164,36 @@ class RecommendationEngine:
             if skill and len(skill) > 1:
                 skill_set.add(skill)
         
-        return skill_set
+        return frozenset(skill_set)
     
-    def calculate_skill_match_score(self, candidate_skills: str, 
-                                   required_skills: str, 
-                                   preferred_skills: str = "") -> Tuple[float, List[str]]:
-        """Calculate skill matching score using TF-IDF and cosine similarity"""
-        if not candidate_skills or not required_skills:
-            return 0.0, []
-        
-        # Extract skill sets
-        candidate_set = self.extract_skill_set(candidate_skills)
-        required_set = self.extract_skill_set(required_skills)
-        preferred_set = self.extract_skill_set(preferred_skills) if preferred_skills else set()
-        
-        # Direct matching
-        required_matches = candidate_set.intersection(required_set)
-        preferred_matches = candidate_set.intersection(preferred_set)
-        
-        # Calculate base score
-        if not required_set:
-            base_score = 0.0
-        else:
-            required_score = len(required_matches) / len(required_set)
-            preferred_score = len(preferred_matches) / len(preferred_set) if preferred_set else 0
-            base_score = (required_score * 0.7) + (preferred_score * 0.3)
-        
+    def _to_mask(self, skill_set: FrozenSet[str]) -> int:
+        """Bitmask of a catalog skill set (memoized on the frozenset)"""
+        return self._mask_cache(skill_set) if skill_set else 0
+    
+    def _candidate_mask(self, skill_set: FrozenSet[str]) -> int:
+        """Bitmask of a candidate's skills; ones no catalog set has seen can't overlap and
+        are dropped (not cached, since later catalog sets may add bits)"""
+        mask = 0
+        for skill in skill_set:
+            bit = self._skill_bit.get(skill)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+    
+    def _build_mask(self, skill_set: FrozenSet[str]) -> int:
+        """Uncached body of _to_mask"""
+        mask = 0
+        for skill in skill_set:
+            bit = self._skill_bit.get(skill)
+            if bit is None:
+                with self._skill_bit_lock:
+                    bit = self._skill_bit.setdefault(skill, len(self._skill_bit))
+            mask |= 1 << bit
+        return mask
+    
+    def _candidate_skill_terms(self, candidate_set: FrozenSet[str]) -> Tuple[float, float]:
+        """(minimum score, category + soft-skill bonus): the skill-score terms that
+        depend only on the candidate"""
         # IMPROVEMENT: Add skill category matching for better recognition
         skill_categories = {
             'technical': {'python', 'java', 'javascript', 'typescript', 'html', 'css', 'react', 'node.js', 'express', 
@@ -192,25 +232,67 @@ class RecommendationEngine:
         else:
             min_score = 0.0
         
+        return min_score, category_bonuses + soft_skills_bonus
+    
+    def calculate_skill_match_score(self, candidate_skills: str, 
+                                   required_skills: str, 
+                                   preferred_skills: str = "",
+                                   similarity: Optional[float] = None) -> Tuple[float, List[str]]:
+        """Calculate skill matching score using hashed term vectors and cosine similarity
+        (pass a precomputed similarity to skip vectorizing the pair)"""
+        if not candidate_skills or not required_skills:
+            return 0.0, []
+        
+        return self._skill_match_sets(
+            self.extract_skill_set(candidate_skills),
+            self.extract_skill_set(required_skills),
+            self.extract_skill_set(preferred_skills),
+            similarity
+        )
+    
+    def _skill_match_sets(self, candidate_set: FrozenSet[str], required_set: FrozenSet[str],
+                          preferred_set: FrozenSet[str],
+                          similarity: Optional[float] = None) -> Tuple[float, List[str]]:
+        """calculate_skill_match_score on already extracted skill sets"""
+        # Direct matching
+        required_matches = candidate_set.intersection(required_set)
+        preferred_matches = candidate_set.intersection(preferred_set)
+        
+        # Calculate base score
+        if not required_set:
+            base_score = 0.0
+        else:
+            required_score = len(required_matches) / len(required_set)
+            preferred_score = len(preferred_matches) / len(preferred_set) if preferred_set else 0
+            base_score = (required_score * 0.7) + (preferred_score * 0.3)
+        
+        min_score, bonus = self._candidate_skill_terms(candidate_set)
+        
         base_score = max(base_score, min_score)
         
         # Apply all bonuses
-        base_score = min(base_score + category_bonuses + soft_skills_bonus, 1.0)
+        base_score = min(base_score + bonus, 1.0)
         
-        # TF-IDF similarity for semantic matching
+        # Term-vector similarity for semantic matching
         try:
-            # Combine all skills for vectorization
+            # Combine all skills for vectorization; sorted like catalog_similarities so
+            # bigrams (and the score) don't depend on set iteration order
             all_skills = [
-                ' '.join(candidate_set),
-                ' '.join(required_set.union(preferred_set))
+                ' '.join(sorted(candidate_set)),
+                ' '.join(sorted(required_set.union(preferred_set)))
             ]
             
-            if all([s.strip() for s in all_skills]):
-                tfidf_matrix = self.tfidf_vectorizer.fit_transform(all_skills)
-                similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-                
-                # Combine direct matching and similarity scores
+            if similarity is not None:
                 final_score = (base_score * 0.6) + (similarity * 0.4)
+            elif all([s.strip() for s in all_skills]):
+                vectors = self.vectorizer.transform(all_skills)
+                if vectors.nnz:
+                    similarity = vectors[0].dot(vectors[1].T).toarray()[0, 0]
+                    
+                    # Combine direct matching and similarity scores
+                    final_score = (base_score * 0.6) + (similarity * 0.4)
+                else:
+                    final_score = base_score
             else:
                 final_score = base_score
         except:
@@ -221,14 +303,49 @@ class RecommendationEngine:
         
         return min(final_score, 1.0), matched_skills
     
+    def _skills_document(self, internship: Dict) -> str:
+        """Required + preferred skills of an internship as one vectorizer document"""
+        skills = self.extract_skill_set(internship.get('required_skills', '')) | \
+            self.extract_skill_set(internship.get('preferred_skills', ''))
+        return ' '.join(sorted(skills))
+    
+    def precompute_internship_vectors(self, internships: List[Dict]):
+        """Hash the catalog's skills once and keep the internship matrix until the catalog changes"""
+        key = tuple(
+            (i.get('id'), i.get('required_skills'), i.get('preferred_skills')) for i in internships
+        )
+        cached_key, matrix = self._intern_vectors
+        if key != cached_key:
+            matrix = self.vectorizer.transform([self._skills_document(i) for i in internships])
+            self._intern_vectors = (key, matrix)
+        return matrix
+    
+    def catalog_similarities(self, candidate_skills: str, internships: List[Dict]) -> List[Optional[float]]:
+        """Cosine similarity of the candidate's skills to every internship, in one pass
+        (None where a side has no skills, matching the per-pair fallback)"""
+        # Sorted like the catalog documents so bigrams don't depend on set order
+        candidate_doc = ' '.join(sorted(self.extract_skill_set(candidate_skills)))
+        matrix = self.precompute_internship_vectors(internships)
+        # No terms anywhere in the catalog (or only stop words): fall back to per-pair scoring
+        if not matrix.nnz or not candidate_doc.strip():
+            return [None] * len(internships)
+        
+        candidate_vec = self.vectorizer.transform([candidate_doc])
+        # Rows are L2-normalized, so one sparse product gives every cosine
+        sims = (candidate_vec @ matrix.T).toarray().ravel()
+        return [
+            float(sim) if internship.get('required_skills') else None
+            for sim, internship in zip(sims, internships)
+        ]
+    
     def check_location_match(self, candidate_location: str, 
                            internship_location: str) -> Tuple[bool, float]:
         """Check if candidate location matches internship location"""
         if not candidate_location or not internship_location:
             return True, 0.5  # Neutral score if location not specified
         
-        candidate_loc = candidate_location.lower().strip()
-        internship_loc = internship_location.lower().strip()
+        candidate_loc = _norm(candidate_location)
+        internship_loc = _norm(internship_location)
         
         # Check for remote opportunities
         if 'remote' in internship_loc or 'anywhere' in internship_loc:
@@ -238,25 +355,15 @@ class RecommendationEngine:
         if candidate_loc == internship_loc:
             return True, 1.0
         
+        shared_groups = _location_groups(candidate_loc) & _location_groups(internship_loc)
+        
         # Partial match (e.g., NCR region)
-        ncr_cities = ['delhi', 'gurgaon', 'gurugram', 'noida', 'faridabad', 'ghaziabad', 'ncr']
-        if any(city in candidate_loc for city in ncr_cities) and \
-           any(city in internship_loc for city in ncr_cities):
+        if _NCR_GROUP in shared_groups:
             return True, 0.9
         
         # Check if cities are in same state (simplified)
-        major_city_groups = [
-            ['mumbai', 'pune', 'nashik', 'nagpur'],  # Maharashtra
-            ['bangalore', 'bengaluru', 'mysore'],  # Karnataka
-            ['chennai', 'coimbatore', 'madurai'],  # Tamil Nadu
-            ['hyderabad', 'vijayawada', 'visakhapatnam'],  # Telangana/Andhra
-            ['kolkata', 'howrah', 'durgapur']  # West Bengal
-        ]
-        
-        for group in major_city_groups:
-            if any(city in candidate_loc for city in group) and \
-               any(city in internship_loc for city in group):
-                return True, 0.7
+        if shared_groups:
+            return True, 0.7
         
         return False, 0.0
     
@@ -270,10 +377,8 @@ class RecommendationEngine:
             return False, 0.0
         
         # IMPROVEMENT: Handle compound education levels like "Diploma/Certificate"
-        candidate_education_clean = candidate_education.lower().strip()
-        required_level = self.education_hierarchy.get(
-            min_education.lower().strip(), 0
-        )
+        candidate_education_clean = _norm(candidate_education)
+        required_level = self.education_hierarchy.get(_norm(min_education), 0)
         
         # Check for multiple education levels in candidate (e.g., "Diploma/Certificate")
         candidate_levels = []
@@ -348,7 +453,8 @@ class RecommendationEngine:
         return min(bonus, 1.0)  # Cap at 100%
     
     def calculate_hybrid_score(self, candidate: Dict, 
-                             internship: Dict) -> Tuple[float, str, List[str]]:
+                             internship: Dict,
+                             similarity: Optional[float] = None) -> Tuple[float, str, List[str]]:
         """Calculate hybrid recommendation score combining multiple factors"""
         score_components = []
         explanations = []
@@ -358,7 +464,8 @@ class RecommendationEngine:
         skill_score, matched = self.calculate_skill_match_score(
             candidate.get('skills', ''),
             internship.get('required_skills', ''),
-            internship.get('preferred_skills', '')
+            internship.get('preferred_skills', ''),
+            similarity
         )
         score_components.append(('skills', skill_score * 0.45))
         matched_skills = matched
@@ -415,9 +522,10 @@ class RecommendationEngine:
                 explanation_parts.append("Fresh perspective welcome!")
         
         if loc_match and candidate.get('location'):
-            if 'remote' in internship.get('location', '').lower():
+            internship_loc = _norm(internship.get('location', ''))
+            if 'remote' in internship_loc:
                 explanation_parts.append("Remote opportunity")
-            elif candidate.get('location', '').lower() == internship.get('location', '').lower():
+            elif _norm(candidate.get('location', '')) == internship_loc:
                 explanation_parts.append(f"Location match: {candidate.get('location')}")
         
         if edu_eligible and edu_score > 0.7:
@@ -436,16 +544,102 @@ class RecommendationEngine:
         
         return total_score, explanation, matched_skills
     
+    def _prepare_internships(self, internships: List[Dict]) -> Tuple[List[FrozenSet[str]], List[FrozenSet[str]]]:
+        """Required and preferred skill sets per internship, extracted once per request"""
+        required_sets = [self.extract_skill_set(i.get('required_skills', '')) for i in internships]
+        preferred_sets = [self.extract_skill_set(i.get('preferred_skills', '')) for i in internships]
+        return required_sets, preferred_sets
+    
+    def score_catalog(self, candidate: Dict, internships: List[Dict],
+                      sims: List[Optional[float]],
+                      skill_sets: Optional[Tuple[List[FrozenSet[str]], List[FrozenSet[str]]]] = None) -> np.ndarray:
+        """Hybrid scores for every internship at once; same formula as calculate_hybrid_score.
+        Candidate-only terms are computed once, per-internship lookups are memoized by value
+        and the weighting runs as array arithmetic."""
+        n = len(internships)
+        candidate_set = self.extract_skill_set(candidate.get('skills', ''))
+        min_score, bonus = self._candidate_skill_terms(candidate_set)
+        potential = self.calculate_potential_bonus(candidate, {})
+        required_sets, preferred_sets = skill_sets or self._prepare_internships(internships)
+        
+        req = np.zeros(n)
+        pref = np.zeros(n)
+        has_required = np.zeros(n, dtype=bool)
+        sim = np.full(n, np.nan)
+        loc = np.empty(n)
+        edu = np.empty(n)
+        exp = np.empty(n)
+        edu_ok = np.empty(n, dtype=bool)
+        exp_ok = np.empty(n, dtype=bool)
+        
+        # Few distinct locations / education levels / experience requirements in a catalog
+        loc_memo, edu_memo, exp_memo = {}, {}, {}
+        candidate_loc = candidate.get('location')
+        candidate_edu = candidate.get('education')
+        candidate_exp = candidate.get('experience_years', 0)
+        # Catalog masks first so every catalog skill has its bit before the candidate's mask
+        required_masks = [self._to_mask(s) for s in required_sets]
+        preferred_masks = [self._to_mask(s) for s in preferred_sets]
+        candidate_mask = self._candidate_mask(candidate_set)
+        for k, (internship, similarity) in enumerate(zip(internships, sims)):
+            if internship.get('required_skills'):
+                has_required[k] = True
+                required_mask = required_masks[k]
+                if required_mask:
+                    req[k] = (candidate_mask & required_mask).bit_count() / required_mask.bit_count()
+                    preferred_mask = preferred_masks[k]
+                    if preferred_mask:
+                        pref[k] = (candidate_mask & preferred_mask).bit_count() / preferred_mask.bit_count()
+            if similarity is not None:
+                sim[k] = similarity
+            
+            location = internship.get('location')
+            if location not in loc_memo:
+                loc_memo[location] = self.check_location_match(candidate_loc, location)[1]
+            loc[k] = loc_memo[location]
+            
+            min_education = internship.get('min_education')
+            if min_education not in edu_memo:
+                edu_memo[min_education] = self.check_education_eligibility(
+                    candidate_edu, min_education
+                )
+            edu_ok[k], edu[k] = edu_memo[min_education]
+            
+            required_exp = internship.get('experience_required', 0)
+            if required_exp not in exp_memo:
+                exp_memo[required_exp] = self.check_experience_eligibility(
+                    candidate_exp, required_exp
+                )
+            exp_ok[k], exp[k] = exp_memo[required_exp]
+        
+        # Skill score (calculate_skill_match_score)
+        base = np.where(has_required, req * 0.7 + pref * 0.3, 0.0)
+        base = np.minimum(np.maximum(base, min_score) + bonus, 1.0)
+        skill = np.minimum(np.where(np.isnan(sim), base, base * 0.6 + sim * 0.4), 1.0)
+        if not candidate.get('skills', ''):
+            skill[:] = 0.0
+        skill[~has_required] = 0.0
+        
+        total = skill * 0.45 + loc * 0.2 + edu * 0.15 + exp * 0.1 + potential * 0.1
+        failed = (~edu_ok).astype(np.int8) + (~exp_ok).astype(np.int8)
+        total = np.where(failed == 2, total * 0.3, np.where(failed == 1, total * 0.7, total))
+        return np.maximum(total, 0.1)
+    
     def identify_skill_gaps(self, candidate_skills: str, 
                            internship: Dict) -> List[str]:
         """Identify skills candidate should learn to qualify better"""
         if not internship.get('required_skills'):
             return []
         
-        candidate_set = self.extract_skill_set(candidate_skills)
-        required_set = self.extract_skill_set(internship.get('required_skills', ''))
-        preferred_set = self.extract_skill_set(internship.get('preferred_skills', ''))
-        
+        return self._skill_gaps_sets(
+            self.extract_skill_set(candidate_skills),
+            self.extract_skill_set(internship.get('required_skills', '')),
+            self.extract_skill_set(internship.get('preferred_skills', ''))
+        )
+    
+    def _skill_gaps_sets(self, candidate_set: FrozenSet[str], required_set: FrozenSet[str],
+                         preferred_set: FrozenSet[str]) -> List[str]:
+        """identify_skill_gaps on already extracted skill sets"""
         # Find missing required skills
         missing_required = required_set - candidate_set
         missing_preferred = preferred_set - candidate_set
@@ -455,6 +649,24 @@ class RecommendationEngine:
         
         return skill_gaps[:5]  # Return top 5 skill gaps
     
+    def warmup(self):
+        """Score a sample profile against the catalog so the first real request
+        doesn't pay one-off costs (regex compilation, sklearn/numpy init, page cache)"""
+        # Same call as get_recommendations, so this also fills the database's catalog cache
+        internships = self.db.get_all_internships(active_only=True)
+        sample_candidate = {
+            'skills': 'Python, SQL, Product Management, Communication',
+            'location': '',
+            'education': "Bachelor's",
+            'experience_years': 0
+        }
+        sims = self.catalog_similarities(sample_candidate['skills'], internships)
+        self.score_catalog(sample_candidate, internships, sims, self._prepare_internships(internships))
+        # Only the top N rows get the detailed scalar pass per request
+        for internship, similarity in zip(internships[:5], sims[:5]):
+            self.calculate_hybrid_score(sample_candidate, internship, similarity)
+        logger.info(f"Recommendation engine warmed up on {len(internships)} internships")
+    
     def get_recommendations(self, candidate_id: int, 
                           top_n: int = 5,
                           use_cache: bool = True) -> List[Dict]:
@@ -475,18 +687,27 @@ class RecommendationEngine:
         # Get all active internships
         internships = self.db.get_all_internships(active_only=True)
         
-        # Calculate scores for each internship
+        # One vectorizer transform for the candidate against the whole catalog
+        sims = self.catalog_similarities(candidate.get('skills', ''), internships)
+        candidate_set = self.extract_skill_set(candidate.get('skills', ''))
+        
+        # Rank the whole catalog with array math, then detail only the top N
+        skill_sets = self._prepare_internships(internships)
+        scores = self.score_catalog(candidate, internships, sims, skill_sets)
+        # Stable sort, best first: ties keep catalog order, so the top N is reproducible
+        top_idx = np.argsort(-scores, kind='stable')[:max(top_n, 0)]
+        
         recommendations = []
-        for internship in internships:
+        for i in top_idx:
+            internship, similarity = internships[i], sims[i]
             score, explanation, matched_skills = self.calculate_hybrid_score(
-                candidate, internship
+                candidate, internship, similarity
             )
             
             # Add skill gap suggestions
-            skill_gaps = self.identify_skill_gaps(
-                candidate.get('skills', ''),
-                internship
-            )
+            skill_gaps = self._skill_gaps_sets(
+                candidate_set, skill_sets[0][i], skill_sets[1][i]
+            ) if internship.get('required_skills') else []
             
             recommendation = {
                 'internship_id': internship['id'],
@@ -505,21 +726,13 @@ class RecommendationEngine:
             }
             
             recommendations.append(recommendation)
-            
-            # Save to cache (per internship)
-            self.db.save_recommendation(
-                candidate_id, 
-                internship['id'],
-                score,
-                explanation
-            )
         
-        # Sort by score and return top N
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
-        top_recommendations = recommendations[:top_n]
+        # Already ranked; cache them with one write (an empty result is not worth a round trip)
+        if recommendations:
+            self.db.save_recommendations(candidate_id, recommendations)
         
-        logger.info(f"Generated {len(top_recommendations)} recommendations for candidate {candidate_id}")
-        return top_recommendations
+        logger.info(f"Generated {len(recommendations)} recommendations for candidate {candidate_id}")
+        return recommendations
     
     def get_similar_candidates(self, candidate_id: int, top_n: int = 5) -> List[Dict]:
         """Find similar candidates based on skills and profile (for networking)"""
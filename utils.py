@@ -21,7 +21,8 @@ class Utils:
     @staticmethod
     def verify_password(password: str, password_hash: str) -> bool:
         """Verify password against hash"""
-        return Utils.hash_password(password) == password_hash
+        # Constant-time comparison so response timing doesn't leak the hash
+        return secrets.compare_digest(Utils.hash_password(password), password_hash)
     
     @staticmethod
     def generate_random_string(length: int = 32) -> str: